@@ -1,69 +1,2122 @@
+import argparse
+import hashlib
+import json
+import logging
+import math
+import mmap
+import multiprocessing
+import os
+import re
+import struct
 import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
+from heapq import heapify, heappush
+from itertools import count
+from multiprocessing import shared_memory
+
 import fitz  # PyMuPDF
+from PyQt5 import sip
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QFileDialog, QScrollArea, QLabel,
-    QVBoxLayout, QSlider, QStatusBar, QLineEdit, QHBoxLayout, QWidget
+    QApplication, QMainWindow, QFileDialog, QAbstractScrollArea, QLabel,
+    QSlider, QStatusBar, QLineEdit, QHBoxLayout, QWidget, QDockWidget, QPlainTextEdit, QOpenGLWidget,
+    QProgressBar, QPushButton
+)
+from PyQt5.QtCore import (
+    Qt, QObject, QThread, QTimer, pyqtSignal, QMutex, QMutexLocker, QWaitCondition, QPoint, QRect, QRectF,
+    QSize, QCoreApplication
+)
+from PyQt5.QtGui import (
+    QImage, QPixmap, QIntValidator, QPainter, QColor, QFontDatabase, QMatrix4x4, QVector2D,
+    QOpenGLContext, QOpenGLShader, QOpenGLShaderProgram, QOpenGLTexture, QOpenGLVersionProfile
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QMutex, QMutexLocker, QPoint
-from PyQt5.QtGui import QImage, QPixmap, QIntValidator
 
 
-class RenderPageThread(QThread):
-    rendered = pyqtSignal(int, QPixmap)  # Signal emitted when a page is rendered
+# Render backend: "process" hands pages to worker processes that return pixels
+# through shared memory, "thread" renders inside this process. PyMuPDF holds the
+# GIL while it rasterizes, so only processes render in parallel (and keep the GUI
+# responsive); the thread backend runs a single worker unless told otherwise.
+RENDER_BACKEND = os.environ.get("APK_RENDER_BACKEND", "process")
 
-    def __init__(self, document, page_number, zoom_factor):
-        super().__init__()
+# How document files are read: "file" lets MuPDF read the file itself, "mmap"
+# maps it read-only and hands PyMuPDF the mapping as a stream, so file data
+# stays in the OS page cache (paged in and out on demand) instead of being
+# copied into each process that opens the document.
+OPEN_MODE = os.environ.get("APK_OPEN_MODE", "file")
+
+# Compositor: "raster" paints pixmaps with QPainter, "opengl" keeps them as GPU
+# textures and draws every frame as textured quads (falls back to raster when
+# no OpenGL context can be created, e.g. on the offscreen platform).
+COMPOSITOR = os.environ.get("APK_COMPOSITOR", "raster")
+
+# Logging: one logger per subsystem under "acrobatprokiller". Runs are quiet
+# (warnings only) unless APK_LOG_LEVEL or --log-level raise the level, and
+# APK_LOG / --log ("render=debug,cache=info") tune single subsystems.
+# Messages use lazy %-formatting so disabled levels cost one cached check.
+LOG_LEVEL = os.environ.get("APK_LOG_LEVEL", "WARNING")
+LOG_SUBSYSTEMS = os.environ.get("APK_LOG", "")
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+log = logging.getLogger("acrobatprokiller")
+render_log = log.getChild("render")
+scheduler_log = log.getChild("scheduler")
+cache_log = log.getChild("cache")
+layout_log = log.getChild("layout")
+
+
+def configure_logging(level=LOG_LEVEL, subsystems=LOG_SUBSYSTEMS):
+    """Send acrobatprokiller logs to stderr at `level`, with per-subsystem overrides.
+
+    `subsystems` is a comma-separated list of name=level pairs, e.g. "render=debug,cache=info".
+    Raises ValueError for an unknown level name, before anything is changed.
+    """
+    levels = {}
+    for item in filter(None, (part.strip() for part in subsystems.split(","))):
+        name, _, subsystem_level = item.partition("=")
+        levels[name.strip()] = log_level(subsystem_level.strip() or "DEBUG")
+    level = log_level(level)
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        log.addHandler(handler)
+        log.propagate = False
+    log.setLevel(level)
+    for name, subsystem_level in levels.items():
+        log.getChild(name).setLevel(subsystem_level)
+
+
+def log_level(name):
+    """Numeric logging level for a name like "info"; ValueError if there is no such level."""
+    level = logging.getLevelName(name.upper())
+    if not isinstance(level, int):
+        raise ValueError(f"unknown log level {name!r} (use debug, info, warning, error or critical)")
+    return level
+
+
+# Pages whose rendered size would exceed this many pixels are rendered as tiles,
+# and only the tiles around the viewport are rasterized.
+TILE_SIZE = 512
+TILE_MARGIN = TILE_SIZE
+TILED_RENDER_THRESHOLD = 2048 * 2048
+
+# Render priority layers, most urgent first. Within a layer jobs are ordered by
+# their distance from the viewport center.
+RENDER_LAYER_PREVIEW = 0
+RENDER_LAYER_VISIBLE = 1
+RENDER_LAYER_PREFETCH = 2
+RENDER_LAYER_REFINE = 3
+RENDER_LAYER_BACKGROUND = 4
+PREFETCH_PAGES = 2
+
+# While scrolling, prefetch extends ahead of the motion over the distance the
+# viewport travels during PREFETCH_LOOKAHEAD_RENDERS page renders (measured),
+# up to PREFETCH_MAX_PAGES and this share of the pixmap cache budget.
+PREFETCH_LOOKAHEAD_RENDERS = 3
+PREFETCH_MAX_PAGES = 24
+PREFETCH_BUDGET_SHARE = 0.5
+
+# Once the view has been still for BACKGROUND_IDLE_DELAY_MS, the workers render
+# whole pages beyond the prefetch range, nearest first, within this share of the
+# pixmap cache budget. Any scroll or zoom drops that work again. Only the process
+# backend does this: a render thread holds the GIL for a whole page, and the GUI
+# would stall on pages nobody asked for.
+BACKGROUND_IDLE_DELAY_MS = 500
+BACKGROUND_RENDER_SHARE = 0.25
+BACKGROUND_RENDER_PAGES = 32
+
+# Page sizes read when a document opens; the rest are read as pages come into
+# view and in chunks while the view is idle, so opening costs the same for any
+# page count.
+GEOMETRY_OPEN_PAGES = 32
+GEOMETRY_IDLE_CHUNK_PAGES = 256
+
+# Blank visible pages first get a quick low-resolution pass at this zoom, which
+# is stretched to size until the full-quality render replaces it.
+PREVIEW_ZOOM = 0.25
+
+# Scroll events are coalesced into one visibility/scheduling pass per display
+# frame; this is the frame interval used when the screen reports no refresh rate.
+SCROLL_FRAME_INTERVAL_MS = 16
+
+# During a zoom gesture the pages on screen are only rescaled by the painter;
+# renders at the new zoom start once no zoom change has arrived for about as long
+# as re-rendering the visible area is expected to take (measured), clamped to
+# this range. ZOOM_SETTLE_DEFAULT_MS applies before anything has been measured.
+ZOOM_SETTLE_MIN_MS = 40
+ZOOM_SETTLE_MAX_MS = 400
+ZOOM_SETTLE_DEFAULT_MS = 150
+
+# Rendered pixmaps are kept up to this many bytes (APK_PIXMAP_CACHE_MB), with
+# at most this share of the budget reserved for pages that were reused.
+PIXMAP_CACHE_BUDGET = int(os.environ.get("APK_PIXMAP_CACHE_MB", "512")) * 1024 * 1024
+PIXMAP_CACHE_PROTECTED_SHARE = 0.8
+
+# The OpenGL compositor keeps page and tile textures up to this many bytes of
+# video memory (APK_TEXTURE_CACHE_MB), least recently drawn evicted first.
+TEXTURE_CACHE_BUDGET = int(os.environ.get("APK_TEXTURE_CACHE_MB", "256")) * 1024 * 1024
+
+# OpenGL enums used by the compositor
+GL_TRIANGLE_STRIP = 0x0005
+GL_MAX_TEXTURE_SIZE = 0x0D33
+
+# Whole-page renders are also kept on disk across sessions, up to
+# APK_DISK_CACHE_MB (0 disables the disk cache).
+DISK_CACHE_DIR = os.environ.get(
+    "APK_DISK_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "acrobatprokiller")
+)
+DISK_CACHE_BUDGET = int(os.environ.get("APK_DISK_CACHE_MB", "1024")) * 1024 * 1024
+
+
+# Pages are rendered at discrete zoom levels (powers of ZOOM_PYRAMID_BASE) and
+# scaled down to the exact zoom on screen, so nearby zooms share one render.
+# Once the view has been still for a while, visible whole pages are rendered
+# again at the exact zoom (RENDER_LAYER_REFINE) to replace the scaled level.
+ZOOM_PYRAMID_BASE = math.sqrt(2)
+
+
+def pyramid_zoom(zoom_factor):
+    """Smallest pyramid level at or above `zoom_factor`."""
+    level = math.ceil(math.log(zoom_factor, ZOOM_PYRAMID_BASE) - 1e-9)
+    return round(ZOOM_PYRAMID_BASE ** level, 6)
+
+
+def tile_clip(tile, zoom_factor):
+    """Return the page-space clip rectangle of a tile, or None for a whole-page render."""
+    if tile is None:
+        return None
+    column, row = tile
+    return (
+        column * TILE_SIZE / zoom_factor,
+        row * TILE_SIZE / zoom_factor,
+        (column + 1) * TILE_SIZE / zoom_factor,
+        (row + 1) * TILE_SIZE / zoom_factor,
+    )
+
+
+# Parsed page content streams kept per worker, so zoom changes, tiles and
+# previews only pay rasterization and not re-interpretation of the page.
+DISPLAY_LIST_CACHE_PAGES = 32
+
+# Page render slots kept by the page view; grows to cover the pinned pages
+PAGE_SLOT_POOL = 32
+
+# Render statistics: the stats dock refreshes at this interval while shown, and
+# the snapshot is written to APK_STATS_FILE (or --stats-json) on exit if set.
+STATS_REFRESH_MS = 500
+STATS_FILE = os.environ.get("APK_STATS_FILE")
+
+
+class TimingHistogram:
+    """Latency histogram with power-of-two microsecond buckets."""
+
+    bucket_count = 32
+
+    def __init__(self):
+        self.buckets = [0] * self.bucket_count
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        micros = int(seconds * 1e6)
+        self.buckets[min(micros.bit_length(), self.bucket_count - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        """Upper bound in milliseconds of the bucket that holds `fraction` of the samples."""
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if bucket and seen >= fraction * self.count:
+                return min((1 << index) / 1000, self.max * 1000)
+        return 0.0
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p90_ms": round(self.percentile(0.9), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max * 1000, 3),
+            # bucket upper bound in microseconds -> samples
+            "buckets_us": {str(1 << index): bucket for index, bucket in enumerate(self.buckets) if bucket},
+        }
+
+
+class RenderStats:
+    """Per-stage timing histograms and event counters of the render pipeline.
+
+    Stages are recorded from the workers (parse, rasterize, qimage, ipc,
+    disk_load, disk_store) and the GUI thread (schedule, upload, display,
+    paint). Safe to record from any thread.
+    """
+
+    def __init__(self):
+        self.mutex = QMutex()
+        self.histograms = {}
+        self.counters = {}
+
+    def record(self, stage, seconds):
+        with QMutexLocker(self.mutex):
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = TimingHistogram()
+            histogram.add(seconds)
+
+    def record_all(self, timings):
+        for stage, seconds in timings.items():
+            self.record(stage, seconds)
+
+    def increment(self, counter, amount=1):
+        with QMutexLocker(self.mutex):
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def snapshot(self):
+        with QMutexLocker(self.mutex):
+            return {
+                "stages": {stage: histogram.to_dict() for stage, histogram in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def reset(self):
+        with QMutexLocker(self.mutex):
+            self.histograms.clear()
+            self.counters.clear()
+
+
+def hit_ratio(hits, misses):
+    return round(hits / (hits + misses), 4) if hits + misses else None
+
+
+class DisplayListCache:
+    """Bounded LRU of fitz.DisplayList objects for one open document.
+
+    Each worker (thread or process) owns its own document and cache; the engine
+    hands a page's jobs to the workers that already parsed it where it can.
+    """
+
+    def __init__(self, document, max_pages=DISPLAY_LIST_CACHE_PAGES):
         self.document = document
-        self.page_number = page_number
-        self.zoom_factor = zoom_factor
+        self.max_pages = max_pages
+        self.display_lists = OrderedDict()
+        self.timings = {}  # stage -> seconds spent in the last get_pixmap call
+
+    def get(self, page_number):
+        display_list = self.display_lists.pop(page_number, None)
+        if display_list is None:
+            start = time.perf_counter()
+            display_list = self.document[page_number].get_displaylist()
+            self.timings["parse"] = time.perf_counter() - start
+        self.display_lists[page_number] = display_list
+        while len(self.display_lists) > self.max_pages:
+            self.display_lists.popitem(last=False)
+        return display_list
+
+    def get_pixmap(self, page_number, zoom_factor, clip=None):
+        """Rasterize a page (or the clipped part of it) from its cached display list."""
+        self.timings = {}
+        display_list = self.get(page_number)
+        start = time.perf_counter()
+        matrix = fitz.Matrix(zoom_factor, zoom_factor)
+        pix = display_list.get_pixmap(matrix=matrix, alpha=False, clip=clip)
+        self.timings["rasterize"] = time.perf_counter() - start
+        return pix
+
+    def clear(self):
+        self.display_lists.clear()
+
+
+class RenderedImage:
+    """A finished render whose QImage borrows the pixel memory of `owner`.
+
+    Workers hand over the fitz.Pixmap (or shared-memory slot) the pixels were
+    rendered into instead of copying them. The GUI thread calls to_pixmap(),
+    which uploads the pixels once and then releases the borrowed buffer.
+    A worker that still needs the pixels (to write them to the disk cache)
+    retain()s the image, and the buffer goes back with the last release().
+    """
+
+    __slots__ = ("image", "owner", "on_release", "seconds", "references")
+    mutex = QMutex()
+
+    def __init__(self, image, owner, on_release=None):
+        self.image = image
+        self.owner = owner
+        self.on_release = on_release
+        self.seconds = 0.0  # time the worker spent producing the pixels
+        self.references = 1
+
+    def retain(self):
+        with QMutexLocker(self.mutex):
+            self.references += 1
+
+    def to_pixmap(self):
+        pixmap = QPixmap.fromImage(self.image)
+        self.release()
+        return pixmap
+
+    def release(self):
+        """Drop the QImage first, then hand the buffer back to whoever owns it."""
+        with QMutexLocker(self.mutex):
+            self.references -= 1
+            if self.references > 0:
+                return
+        self.image = None
+        if self.on_release is not None:
+            self.on_release(self.owner)
+        self.owner = None
+        self.on_release = None
+
+
+def document_fingerprint(path, sample_size=1024 * 1024):
+    """Identify a PDF by its size and the bytes at both ends, without reading the whole file."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        digest.update(str(size).encode())
+        f.seek(0)
+        digest.update(f.read(sample_size))
+        if size > sample_size:
+            f.seek(max(sample_size, size - sample_size))
+            digest.update(f.read(sample_size))
+    return digest.hexdigest()
+
+
+class DiskRenderCache:
+    """On-disk cache of whole-page renders shared across sessions.
+
+    Entries are keyed by document fingerprint, page index and zoom bucket (whole
+    percent) and hold raw pixel rows behind a small header, so a hit is mapped
+    straight into a QImage without touching MuPDF. Writes go through a temporary
+    file and os.replace, and the oldest entries are removed once the directory
+    grows past its budget. Safe to use from several worker threads.
+    """
+
+    header = struct.Struct("<4sIIIII")  # magic, version, width, height, stride, QImage format
+    header_size = 32
+    magic = b"APKR"
+    version = 1
+    # Temporary files older than this are left over from an interrupted write;
+    # younger ones may be another viewer's write in progress.
+    stale_temp_seconds = 10 * 60
+
+    def __init__(self, directory=DISK_CACHE_DIR, budget=DISK_CACHE_BUDGET):
+        self.directory = directory
+        self.budget = budget
+        self.mutex = QMutex()
+        self.entries = None  # file name -> (size, mtime), scanned lazily
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def entry_name(self, fingerprint, page_number, zoom_factor):
+        return f"{fingerprint}-{page_number}-{round(zoom_factor * 100)}.apkr"
+
+    def stats(self):
+        with QMutexLocker(self.mutex):
+            return {
+                "entries": len(self.entries or ()),
+                "bytes_used": self.bytes_used,
+                "budget": self.budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": hit_ratio(self.hits, self.misses),
+            }
+
+    def scan(self):
+        """Index the cache directory on first use (caller holds the mutex)."""
+        if self.entries is not None:
+            return
+        self.entries = {}
+        self.bytes_used = 0
+        os.makedirs(self.directory, exist_ok=True)
+        stale = time.time() - self.stale_temp_seconds
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.name.endswith(".apkr"):
+                    stat = entry.stat()
+                    self.entries[entry.name] = (stat.st_size, stat.st_mtime)
+                    self.bytes_used += stat.st_size
+                elif entry.name.endswith(".tmp") and entry.stat().st_mtime < stale:
+                    os.remove(entry.path)
+            except OSError:
+                pass  # removed by another viewer meanwhile
+
+    def load(self, fingerprint, page_number, zoom_factor):
+        """Map a cached render into a RenderedImage, or return None on a miss."""
+        name = self.entry_name(fingerprint, page_number, zoom_factor)
+        with QMutexLocker(self.mutex):
+            self.scan()
+            if name not in self.entries:
+                self.misses += 1
+                return None
+            path = os.path.join(self.directory, name)
+            now = time.time()
+            self.entries[name] = (self.entries[name][0], now)
+
+        mapped = None
+        try:
+            os.utime(path, (now, now))
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, width, height, stride, image_format = self.header.unpack_from(mapped)
+            if magic != self.magic or version != self.version or len(mapped) < self.header_size + stride * height:
+                raise ValueError("corrupt cache entry")
+        except (OSError, ValueError, struct.error) as e:
+            if mapped is not None:
+                mapped.close()
+            cache_log.warning("Dropping disk cache entry %s: %s", name, e)
+            self.remove(name)
+            return None
+
+        view = memoryview(mapped)[self.header_size:]
+        image = QImage(sip.voidptr(view), width, height, stride, image_format)
+        with QMutexLocker(self.mutex):
+            self.hits += 1
+        return RenderedImage(image, (view, mapped), self.release_mapping)
+
+    @staticmethod
+    def release_mapping(owner):
+        view, mapped = owner
+        view.release()
+        mapped.close()
+
+    def store(self, fingerprint, page_number, zoom_factor, image):
+        """Atomically write a rendered QImage to the cache, then trim the cache to its budget."""
+        name = self.entry_name(fingerprint, page_number, zoom_factor)
+        path = os.path.join(self.directory, name)
+        pixels = image.constBits()
+        pixels.setsize(image.bytesPerLine() * image.height())
+        header = self.header.pack(self.magic, self.version, image.width(), image.height(),
+                                  image.bytesPerLine(), int(image.format()))
+
+        with QMutexLocker(self.mutex):
+            self.scan()
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(header.ljust(self.header_size, b"\0"))
+                f.write(pixels)
+            os.replace(temp_path, path)
+            temp_path = None
+            size = os.path.getsize(path)
+        except OSError as e:
+            cache_log.warning("Could not write disk cache entry %s: %s", name, e)
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            return
+
+        with QMutexLocker(self.mutex):
+            previous = self.entries.get(name)
+            if previous is not None:
+                self.bytes_used -= previous[0]
+            self.entries[name] = (size, time.time())
+            self.bytes_used += size
+            if self.bytes_used > self.budget:
+                self.trim()
+
+    def trim(self):
+        """Remove least recently used entries down to 90% of the budget (caller holds the mutex)."""
+        target = int(self.budget * 0.9)
+        for name, (size, _) in sorted(self.entries.items(), key=lambda item: item[1][1]):
+            if self.bytes_used <= target:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            del self.entries[name]
+            self.bytes_used -= size
+
+    def remove(self, name):
+        with QMutexLocker(self.mutex):
+            entry = self.entries.pop(name, None)
+            if entry is not None:
+                self.bytes_used -= entry[0]
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+
+def process_render_main(connection):
+    """Entry point of a render process: render jobs from the pipe into shared memory."""
+    document = None
+    document_source = None
+    mapping = None
+    display_lists = None
+    slots = {}  # attached shared-memory slots, least recently used first
+    max_attached_slots = 4
+
+    while True:
+        job = connection.recv()
+        if job is None:
+            break
+
+        page_number, zoom_factor, clip, source, slot_name, slot_size = job
+        try:
+            if source != document_source:
+                if document is not None:
+                    display_lists.clear()
+                    close_document(document, mapping)
+                    document = mapping = None
+                document, mapping = open_document(source)
+                document_source = source
+                display_lists = DisplayListCache(document)
+
+            pix = display_lists.get_pixmap(page_number, zoom_factor, clip)
+
+            nbytes = pix.stride * pix.height
+            if nbytes > slot_size:
+                # Ask the parent for a bigger slot instead of rendering the page twice
+                connection.send(("resize", nbytes))
+                slot_name, slot_size = connection.recv()
+
+            slot = slots.pop(slot_name, None) or shared_memory.SharedMemory(name=slot_name)
+            slots[slot_name] = slot
+            while len(slots) > max_attached_slots:
+                slots.pop(next(iter(slots))).close()
+            slot.buf[:nbytes] = pix.samples_mv
+            connection.send(("ok", pix.width, pix.height, pix.stride, display_lists.timings))
+        except Exception as e:
+            connection.send(("error", str(e)))
+
+    for slot in slots.values():
+        slot.close()
+    if display_lists is not None:
+        display_lists.clear()
+    if document is not None:
+        close_document(document, mapping)
+
+
+class MappedFile:
+    """A file mapped read-only, exposed as the memoryview PyMuPDF reads from in place."""
+
+    def __init__(self, path):
+        self.path = os.path.realpath(path)
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        self.size = len(self.map)
+
+    def close(self):
+        """Unmap; the document reading from the mapping must be closed first."""
+        self.view.release()
+        self.map.close()
+
+
+def open_document(path, mode=None):
+    """fitz.open() `path` according to the open mode; returns (document, MappedFile or None).
+
+    A mapping must outlive its document: close the document, then the mapping.
+    """
+    if (mode or OPEN_MODE) != "mmap":
+        return fitz.open(path), None
+    mapping = MappedFile(path)
+    try:
+        return fitz.open(stream=mapping.view, filetype="pdf"), mapping
+    except Exception:
+        mapping.close()
+        raise
+
+
+def close_document(document, mapping=None):
+    document.close()
+    if mapping is not None:
+        mapping.close()
+
+
+def memory_usage(mapped_path=None):
+    """Resident bytes of this process and, for `mapped_path`, the bytes of it mapped
+    and resident (summed over every mapping of the file), from /proc/self/smaps.
+
+    Values are None where smaps is not available (anything but Linux).
+    """
+    usage = {"rss_bytes": None, "mapped_bytes": None, "mapped_resident_bytes": None}
+    try:
+        with open("/proc/self/smaps") as f:
+            lines = f.readlines()
+    except OSError:
+        return usage
+    rss = mapped = mapped_resident = 0
+    current = None
+    for line in lines:
+        if not line[:1].isupper():
+            # Mapping header: address perms offset dev inode [path]
+            fields = line.split(None, 5)
+            current = fields[5].strip() if len(fields) > 5 else None
+        elif line.startswith("Rss:"):
+            kilobytes = int(line.split()[1])
+            rss += kilobytes
+            if current == mapped_path:
+                mapped_resident += kilobytes
+        elif line.startswith("Size:") and current == mapped_path:
+            mapped += int(line.split()[1])
+    usage["rss_bytes"] = rss * 1024
+    if mapped_path is not None:
+        usage["mapped_bytes"] = mapped * 1024
+        usage["mapped_resident_bytes"] = mapped_resident * 1024
+    return usage
+
+
+def xref_looks_intact(path, tail_size=2048):
+    """Cheap check that the last startxref points at an xref table or stream.
+
+    Files failing it would be repaired by MuPDF while opening, which can take
+    seconds for large files.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - tail_size))
+        match = re.search(rb"startxref\s+(\d+)\s+%%EOF", f.read())
+        if match is None or int(match.group(1)) >= size:
+            return False
+        f.seek(int(match.group(1)))
+        return re.match(rb"\s*(xref|\d+\s+\d+\s+obj)", f.read(64)) is not None
+
+
+def process_open_main(connection, path, repaired_path):
+    """Entry point of a document repair process: open `path` (repairing it) away from the
+    viewer's GIL and save the repaired file to `repaired_path`, so the viewer and its
+    workers open that instead. Replies whether the file needed repairing."""
+    try:
+        document = fitz.open(path)
+        repaired = document.is_repaired
+        if repaired:
+            document.save(repaired_path)
+        document.close()
+        connection.send(("ok", repaired))
+    except Exception as e:
+        connection.send(("error", str(e)))
+
+
+class RenderWorker(QThread):
+    """Long-lived worker thread that pulls render jobs from the engine queue."""
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+        self.document = None
+        self.document_source = None
+        self.mapping = None
+        self.display_lists = None
+
+    def open_document(self, source):
+        """Open a private document handle so workers never share a fitz.Document."""
+        if source != self.document_source:
+            self.cleanup()
+            if source:
+                self.document, self.mapping = open_document(source)
+            self.display_lists = DisplayListCache(self.document) if self.document else None
+            self.document_source = source
+        return self.document
+
+    def render(self, page_number, zoom_factor, clip, source):
+        """Rasterize a page (or the clipped part of it) into a RenderedImage."""
+        self.open_document(source)
+        pix = self.display_lists.get_pixmap(page_number, zoom_factor, clip)
+        self.engine.stats.record_all(self.display_lists.timings)
+        start = time.perf_counter()
+        # Wrap MuPDF's own sample buffer; the RenderedImage keeps `pix` alive until Qt has the pixels
+        image = QImage(sip.voidptr(pix.samples_ptr), pix.width, pix.height, pix.stride, QImage.Format_RGB888)
+        self.engine.stats.record("qimage", time.perf_counter() - start)
+        return RenderedImage(image, pix)
+
+    def cleanup(self):
+        if self.display_lists is not None:
+            self.display_lists.clear()
+            self.display_lists = None
+        if self.document is not None:
+            close_document(self.document, self.mapping)
+            self.document = None
+            self.mapping = None
+            self.document_source = None
 
     def run(self):
+        while True:
+            taken = self.engine.take_job(self)
+            if taken is None:
+                break
+
+            job, source, fingerprint = taken
+            stats = self.engine.stats
+            disk_cache = self.engine.disk_cache if job.tile is None and fingerprint else None
+            img = None
+            error = None
+            store_image = None  # a fresh whole-page render, written to the disk cache after display
+            started = time.perf_counter()
+            try:
+                if disk_cache is not None:
+                    start = time.perf_counter()
+                    img = disk_cache.load(fingerprint, job.page_number, job.zoom_factor)
+                    stats.record("disk_load", time.perf_counter() - start)
+                    if img is not None:
+                        img.seconds = time.perf_counter() - started
+                if img is None:
+                    render_log.debug("Starting render for page %d tile %s at zoom %.0f%%",
+                                     job.page_number, job.tile, job.zoom_factor * 100)
+                    img = self.render(job.page_number, job.zoom_factor, tile_clip(job.tile, job.zoom_factor), source)
+                    img.seconds = time.perf_counter() - started
+                    stats.increment("rendered")
+                    if disk_cache is not None:
+                        store_image = img.image
+                        img.retain()
+            except Exception as e:
+                error = str(e)
+                stats.increment("failed")
+                render_log.error("Error rendering page %d: %s", job.page_number, e)
+
+            current_job = self.engine.finish_job(job)
+            if current_job is None:
+                if img is not None:
+                    img.release()
+                stats.increment("cancelled")
+                render_log.debug("Discarded cancelled render for page %d tile %s", job.page_number, job.tile)
+            elif img is not None:
+                job = current_job
+                self.engine.rendered.emit(job, img)
+                render_log.debug("Finished render for page %d tile %s", job.page_number, job.tile)
+            else:
+                self.engine.failed.emit(current_job, error)
+
+            if store_image is not None:
+                # The GUI already has the render; the buffer stays ours until the write is done
+                start = time.perf_counter()
+                try:
+                    disk_cache.store(fingerprint, job.page_number, job.zoom_factor, store_image)
+                except Exception as e:
+                    cache_log.warning("Could not store page %d in the disk cache: %s", job.page_number, e)
+                stats.record("disk_store", time.perf_counter() - start)
+                store_image = None
+                img.release()
+
+        self.cleanup()
+
+
+class ProcessRenderWorker(RenderWorker):
+    """Worker thread that drives one render process and reads its pixels from shared memory.
+
+    The process opens its own copy of the document, so rasterization runs in
+    parallel with the GUI and the other workers instead of competing for the GIL.
+    Only the job description and image geometry travel over the pipe.
+    """
+
+    initial_slot_size = 8 * 1024 * 1024
+    max_free_slots = 3
+
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.start_process()
+        self.free_slots = []
+        self.slot_mutex = QMutex()
+        self.stopped = False
+
+    def start_process(self):
+        context = multiprocessing.get_context("spawn")
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=process_render_main, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def restart_process(self):
+        """Replace a render process that died (e.g. MuPDF crashed on a page) with a fresh one."""
+        render_log.warning("Render process %s exited with code %s, starting a new one",
+                           self.process.pid, self.process.exitcode)
+        self.connection.close()
+        self.process.join(1)
+        self.start_process()
+
+    def acquire_slot(self, size):
+        """Take the smallest free shared pixel buffer of at least `size` bytes, or create one."""
+        with QMutexLocker(self.slot_mutex):
+            fitting = [slot for slot in self.free_slots if slot.size >= size]
+            if fitting:
+                slot = min(fitting, key=lambda slot: slot.size)
+                self.free_slots.remove(slot)
+                return slot
+        return shared_memory.SharedMemory(create=True, size=max(size, self.initial_slot_size))
+
+    def recycle_slot(self, slot):
+        """Return a slot once the GUI is done with it; keeps a few around for reuse."""
+        with QMutexLocker(self.slot_mutex):
+            if not self.stopped and len(self.free_slots) < self.max_free_slots:
+                self.free_slots.append(slot)
+                return
+        slot.close()
+        slot.unlink()
+
+    def render(self, page_number, zoom_factor, clip, source):
+        if not self.process.is_alive():
+            self.restart_process()
+        slot = self.acquire_slot(0)
+        start = time.perf_counter()
+        try:
+            self.connection.send((page_number, zoom_factor, clip, source, slot.name, slot.size))
+            reply = self.connection.recv()
+            if reply[0] == "resize":
+                self.recycle_slot(slot)
+                slot = self.acquire_slot(reply[1])
+                self.connection.send((slot.name, slot.size))
+                reply = self.connection.recv()
+        except (EOFError, OSError):
+            # The process died on this job; the next one gets a new process
+            self.recycle_slot(slot)
+            self.process.join(1)
+            self.restart_process()
+            raise RuntimeError(f"render process died on page {page_number + 1}")
+        if reply[0] == "error":
+            self.recycle_slot(slot)
+            raise RuntimeError(reply[1])
+
+        _, width, height, stride, timings = reply
+        # Whatever the round trip took beyond the child's own stages is pipe and scheduling overhead
+        self.engine.stats.record_all(timings)
+        self.engine.stats.record("ipc", max(0.0, time.perf_counter() - start - sum(timings.values())))
+
+        # The slot itself backs the QImage; it goes back to the pool once the GUI has uploaded it
+        start = time.perf_counter()
+        image = QImage(sip.voidptr(slot.buf), width, height, stride, QImage.Format_RGB888)
+        self.engine.stats.record("qimage", time.perf_counter() - start)
+        return RenderedImage(image, slot, self.recycle_slot)
+
+    def cleanup(self):
         try:
-            print(f"[DEBUG] Starting render for page {self.page_number} at zoom {self.zoom_factor * 100:.0f}%")
-            page = self.document[self.page_number]
-            matrix = fitz.Matrix(self.zoom_factor, self.zoom_factor)
-            pix = page.get_pixmap(matrix=matrix, alpha=False)
-
-            img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-            pixmap = QPixmap.fromImage(img)
-            self.rendered.emit(self.page_number, pixmap)
-            print(f"[DEBUG] Finished render for page {self.page_number}")
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+        with QMutexLocker(self.slot_mutex):
+            self.stopped = True
+            free_slots, self.free_slots = self.free_slots, []
+        for slot in free_slots:
+            slot.close()
+            slot.unlink()
+
+
+class RenderJob(namedtuple("RenderJob", "document_id page_number zoom_factor tile generation preview",
+                           defaults=(False,))):
+    """Immutable description of one render: which document, page, zoom and tile,
+    the viewer generation (bumped on every zoom change or open) it was requested in,
+    and whether it is a low-resolution preview pass.
+    """
+
+    __slots__ = ()
+
+    @property
+    def key(self):
+        """Identity of the pixels produced; the generation is not part of it."""
+        return self.document_id, self.page_number, self.zoom_factor, self.tile
+
+
+class RenderEngine(QObject):
+    """Fixed-size pool of render workers fed from a shared job queue."""
+
+    rendered = pyqtSignal(object, object)  # RenderJob, RenderedImage
+    failed = pyqtSignal(object, str)  # RenderJob, error message
+
+    def __init__(self, max_workers=None, backend=None, parent=None):
+        super().__init__(parent)
+        self.backend = backend or RENDER_BACKEND
+        # More threads than one would only take turns holding the GIL
+        self.max_workers = max_workers or (max(1, QThread.idealThreadCount()) if self.backend == "process" else 1)
+        self.document_source = None
+        self.document_fingerprint = None
+        self.disk_cache = DiskRenderCache() if DISK_CACHE_BUDGET > 0 else None
+        self.stats = RenderStats()
+        self.jobs = []  # heap of (layer, distance, sequence, job)
+        self.queued = {}  # key -> job
+        self.in_flight = {}  # key -> job, or None once cancelled
+        self.page_workers = {}  # page number -> workers that have rendered it, so hold its display list
+        self.waiting_workers = set()
+        self.sequence = count()
+        self.mutex = QMutex()
+        self.job_available = QWaitCondition()
+        self.stopping = False
+        worker_class = ProcessRenderWorker if self.backend == "process" else RenderWorker
+        self.workers = [worker_class(self) for _ in range(self.max_workers)]
+        for worker in self.workers:
+            worker.start()
+        scheduler_log.info("Render engine started with %d %s workers", self.max_workers, self.backend)
+
+    def set_document(self, source, original=None):
+        """Point the workers at a new document and drop all pending work.
+
+        `original` is the file the disk cache knows the document by when
+        `source` is a copy of it (a repaired one); renders are read from `source`.
+        """
+        fingerprint = None
+        original = original or source
+        if original and self.disk_cache is not None:
+            try:
+                fingerprint = document_fingerprint(original)
+            except OSError as e:
+                cache_log.warning("Could not fingerprint %s, disk cache disabled for it: %s", original, e)
+        with QMutexLocker(self.mutex):
+            self.document_source = source
+            self.document_fingerprint = fingerprint
+            self.jobs.clear()
+            self.queued.clear()
+            self.page_workers.clear()
+            for key in self.in_flight:
+                self.in_flight[key] = None
+
+    def submit(self, job, layer=RENDER_LAYER_VISIBLE, distance=0):
+        """Queue a job unless the same pixels are already queued or rendering."""
+        with QMutexLocker(self.mutex):
+            if self.document_source is None:
+                return False
+            if job.key in self.queued or self.in_flight.get(job.key) is not None:
+                return False
+            heappush(self.jobs, (layer, distance, next(self.sequence), job))
+            self.queued[job.key] = job
+            # Wake every worker: the job may be meant for one that already has its page
+            self.job_available.wakeAll()
+            return True
+
+    def schedule(self, requests):
+        """Replace the queue with `requests`, an iterable of (job, layer, distance) tuples.
+
+        Queued jobs that are no longer requested are dropped, and in-flight jobs
+        that are no longer requested are cancelled so their results are discarded.
+        In-flight jobs that are requested again are re-keyed to the new job's
+        generation instead of being rendered a second time.
+        """
+        wanted = {}
+        for job, layer, distance in requests:
+            if job.key not in wanted or (layer, distance) < wanted[job.key][:2]:
+                wanted[job.key] = (layer, distance, job)
+
+        with QMutexLocker(self.mutex):
+            if self.document_source is None:
+                return 0
+            for key in self.in_flight:
+                self.in_flight[key] = wanted[key][2] if key in wanted else None
+
+            self.jobs = []
+            self.queued = {}
+            for key, (layer, distance, job) in wanted.items():
+                if key in self.in_flight:
+                    continue
+                self.jobs.append((layer, distance, next(self.sequence), job))
+                self.queued[key] = job
+            self.jobs.sort()
+            self.job_available.wakeAll()
+            return len(self.jobs)
+
+    def clear(self):
+        """Drop every queued job and cancel the ones in flight."""
+        self.schedule([])
+
+    def take_job(self, worker):
+        """Block until a job is available for `worker`; returns (job, source, fingerprint),
+        or None when the engine shuts down.
+
+        Workers keep their own display lists, so a page's jobs go to a worker
+        that already rendered it. Another worker only takes them while all of
+        those are busy, instead of parsing the page again when one is about to be free.
+        """
+        with QMutexLocker(self.mutex):
+            while True:
+                if self.stopping:
+                    return None
+                index = self.next_job_index(worker)
+                if index is not None:
+                    break
+                self.waiting_workers.add(worker)
+                self.job_available.wait(self.mutex)
+                self.waiting_workers.discard(worker)
+
+            job = self.jobs[index][3]
+            self.jobs[index] = self.jobs[-1]
+            self.jobs.pop()
+            heapify(self.jobs)
+            del self.queued[job.key]
+            self.in_flight[job.key] = job
+            self.page_workers.setdefault(job.page_number, set()).add(worker)
+            if self.jobs:
+                # Jobs held back for this worker's pages are now fair game for the waiting ones
+                self.job_available.wakeAll()
+            return job, self.document_source, self.document_fingerprint
+
+    def next_job_index(self, worker):
+        """Index in the queue of the most urgent job `worker` should take, or None."""
+        best = None
+        for index, entry in enumerate(self.jobs):
+            if best is not None and entry >= self.jobs[best]:
+                continue
+            workers = self.page_workers.get(entry[3].page_number)
+            if not workers or worker in workers or not workers & self.waiting_workers:
+                best = index
+        return best
+
+    def finish_job(self, job):
+        """Mark a job as done; returns the (possibly re-keyed) job, or None if it was cancelled."""
+        with QMutexLocker(self.mutex):
+            return self.in_flight.pop(job.key, None)
+
+    def stats_snapshot(self):
+        """Stage timings, counters, queue state and disk cache usage as a JSON-serializable dict."""
+        with QMutexLocker(self.mutex):
+            queue = {
+                "backend": self.backend,
+                "workers": self.max_workers,
+                "queued": len(self.jobs),
+                "in_flight": sum(1 for job in self.in_flight.values() if job is not None),
+                "cancelled_in_flight": sum(1 for job in self.in_flight.values() if job is None),
+            }
+        snapshot = self.stats.snapshot()
+        snapshot["queue"] = queue
+        if self.disk_cache is not None:
+            snapshot["disk_cache"] = self.disk_cache.stats()
+        return snapshot
+
+    def shutdown(self):
+        """Stop all workers and wait for them to exit."""
+        with QMutexLocker(self.mutex):
+            self.stopping = True
+            self.jobs.clear()
+            self.page_workers.clear()
+            self.queued.clear()
+            for key in self.in_flight:
+                self.in_flight[key] = None
+            self.job_available.wakeAll()
+        for worker in self.workers:
+            worker.wait()
+
+
+class PixmapCache:
+    """Byte-budgeted cache of rendered pixmaps keyed by RenderJob.key.
+
+    Eviction is a segmented LRU: new entries start on probation and move to the
+    protected segment on their first hit, so a one-off scan through the document
+    cannot flush pages that are actually being reread. Keys pinned by the viewer
+    (the renders shown or requested around the viewport) are never evicted.
+    """
+
+    def __init__(self, budget=PIXMAP_CACHE_BUDGET, on_evict=None):
+        self.budget = budget
+        self.protected_budget = int(budget * PIXMAP_CACHE_PROTECTED_SHARE)
+        self.on_evict = on_evict
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.probation_bytes = 0
+        self.protected_bytes = 0
+        self.pinned = set()
+        self.page_zooms = {}  # (document_id, page_number) -> zooms of cached whole-page renders
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def stats(self):
+        return {
+            "entries": len(self),
+            "bytes_used": self.bytes_used,
+            "protected_bytes": self.protected_bytes,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": hit_ratio(self.hits, self.misses),
+            "evictions": self.evictions,
+        }
+
+    @property
+    def bytes_used(self):
+        return self.probation_bytes + self.protected_bytes
+
+    def __len__(self):
+        return len(self.probation) + len(self.protected)
+
+    def __contains__(self, key):
+        return key in self.probation or key in self.protected
+
+    def get(self, key):
+        """Return the cached pixmap for `key` (promoting it), or None."""
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            self.hits += 1
+            return self.protected[key]
+        if key in self.probation:
+            pixmap = self.probation.pop(key)
+            size = self.pixmap_bytes(pixmap)
+            self.probation_bytes -= size
+            self.protected[key] = pixmap
+            self.protected_bytes += size
+            # Demote the least recently used protected entries back to probation
+            while self.protected_bytes > self.protected_budget and len(self.protected) > 1:
+                demoted_key, demoted = self.protected.popitem(last=False)
+                demoted_size = self.pixmap_bytes(demoted)
+                self.protected_bytes -= demoted_size
+                self.probation[demoted_key] = demoted
+                self.probation_bytes += demoted_size
+            self.hits += 1
+            return pixmap
+        self.misses += 1
+        return None
+
+    def put(self, key, pixmap):
+        self.discard(key)
+        self.probation[key] = pixmap
+        self.probation_bytes += self.pixmap_bytes(pixmap)
+        document_id, page_number, zoom_factor, tile = key
+        if tile is None:
+            self.page_zooms.setdefault((document_id, page_number), set()).add(zoom_factor)
+        self.evict()
+
+    def discard(self, key):
+        if key in self.probation:
+            self.probation_bytes -= self.pixmap_bytes(self.probation.pop(key))
+        elif key in self.protected:
+            self.protected_bytes -= self.pixmap_bytes(self.protected.pop(key))
+        else:
+            return
+        document_id, page_number, zoom_factor, tile = key
+        zooms = self.page_zooms.get((document_id, page_number))
+        if tile is None and zooms is not None:
+            zooms.discard(zoom_factor)
+            if not zooms:
+                del self.page_zooms[(document_id, page_number)]
+
+    def nearest_higher_zoom(self, document_id, page_number, zoom_factor):
+        """Smallest cached whole-page zoom above `zoom_factor` for a page, or None."""
+        zooms = self.page_zooms.get((document_id, page_number), ())
+        return min((zoom for zoom in zooms if zoom > zoom_factor), default=None)
+
+    def set_pinned(self, keys):
+        """Keys the viewer is showing or about to show; their entries survive eviction."""
+        self.pinned = set(keys)
+
+    def evict(self):
+        """Drop least recently used, unpinned entries until the cache fits its budget."""
+        while self.bytes_used > self.budget:
+            victim = None
+            for segment in (self.probation, self.protected):
+                victim = next((key for key in segment if key not in self.pinned), None)
+                if victim is not None:
+                    pixmap = segment[victim]
+                    break
+            if victim is None:
+                break
+
+            self.discard(victim)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(victim, pixmap)
+
+    def clear(self):
+        """Forget everything without reporting evictions (used when a new document opens)."""
+        self.probation.clear()
+        self.protected.clear()
+        self.probation_bytes = 0
+        self.protected_bytes = 0
+        self.pinned.clear()
+        self.page_zooms.clear()
+
+
+class DocumentLoader(QThread):
+    """Opens a document off the GUI thread.
+
+    fitz.open() and loading the page tree happen here; the finished document is
+    handed over with `loaded` and from then on only used by the GUI thread.
+    MuPDF keeps the GIL while it works, so files that look damaged are first
+    repaired in a separate process (see process_open_main), which cancel()
+    terminates; otherwise cancel() drops the document once the current step returns.
+    `source` is the file actually opened: `path`, or its repaired copy, and
+    `mapping` its MappedFile in the "mmap" open mode, which the receiver closes
+    after the document.
+    """
+
+    progress = pyqtSignal(str)
+    loaded = pyqtSignal(object)  # fitz.Document
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.source = path
+        self.repaired_path = None
+        self.mapping = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def repair_in_process(self):
+        """Run process_open_main on `path`; returns False if cancelled meanwhile.
+
+        The repaired copy's name is chosen here, so whatever a terminated
+        process left behind can still be deleted.
+        """
+        fd, self.repaired_path = tempfile.mkstemp(prefix="apk-repaired-", suffix=".pdf")
+        os.close(fd)
+        context = multiprocessing.get_context("spawn")
+        connection, child_connection = context.Pipe()
+        process = context.Process(target=process_open_main, args=(child_connection, self.path, self.repaired_path),
+                                  daemon=True)
+        process.start()
+        child_connection.close()
+        try:
+            while not connection.poll(0.05):
+                if self.cancelled:
+                    process.terminate()
+                    return False
+                if not process.is_alive() and not connection.poll():
+                    raise RuntimeError("the repair process exited unexpectedly")
+            reply = connection.recv()
+        finally:
+            connection.close()
+            process.join()
+        if reply[0] == "error":
+            raise RuntimeError(reply[1])
+        if reply[1]:
+            log.warning("%s is damaged, opening a repaired copy", self.path)
+            self.source = self.repaired_path
+        else:
+            self.discard_repaired()
+        return True
+
+    def run(self):
+        start = time.perf_counter()
+        name = os.path.basename(self.path)
+        self.progress.emit(f"Opening {name}...")
+        try:
+            if not xref_looks_intact(self.path):
+                self.progress.emit(f"Repairing {name}...")
+                if not self.repair_in_process():
+                    self.discard_repaired()
+                    log.info("Cancelled opening %s", self.path)
+                    return
+            document, self.mapping = open_document(self.source)
+            if document.is_repaired:
+                log.warning("%s is damaged and was repaired while opening", self.path)
+            if not self.cancelled and document.page_count:
+                # The first page load builds the page tree, which is slow for large files
+                self.progress.emit(f"Reading {document.page_count} pages of {name}...")
+                document.load_page(0)
         except Exception as e:
-            print(f"[ERROR] Error rendering page {self.page_number}: {e}")
+            self.discard_repaired()
+            if not self.cancelled:
+                self.failed.emit(str(e))
+            return
+        if self.cancelled:
+            close_document(document, self.mapping)
+            self.discard_repaired()
+            log.info("Cancelled opening %s", self.path)
+            return
+        log.info("Opened %s in %.3f s", self.path, time.perf_counter() - start)
+        self.loaded.emit(document)
 
+    def discard_repaired(self):
+        """Delete the repaired copy; for opens that failed or that nobody took."""
+        if self.repaired_path is not None:
+            try:
+                os.remove(self.repaired_path)
+            except OSError:
+                pass
+            self.repaired_path = None
+
+
+class PageGeometry:
+    """Compact table of page sizes read from page.rect.
+
+    Sizes (in points), rotations and the cumulative top offset of every page
+    at the current zoom live in flat arrays, roughly 19 bytes per page, so
+    placeholders can be sized and positioned before anything is rendered.
+    Only the first `measured_pages` are read when a document opens; the rest
+    start out with the first page's size and are corrected by measure() as
+    they come into view or as the viewer reads ahead at idle time.
+    """
+
+    def __init__(self, document, spacing=0, margin=0, measured_pages=None):
+        self.document = document
+        self.spacing = spacing
+        self.margin = margin
+        page_count = len(document)
+        self.widths = array("f", bytes(4 * page_count))
+        self.heights = array("f", bytes(4 * page_count))
+        self.rotations = array("H", bytes(2 * page_count))
+        self.known = bytearray(page_count)  # 1 once a page's real size has been read
+        self.next_unknown = 0
+        self.offsets = array("q", bytes(8 * (page_count + 1)))
+        self.zoom_factor = None
+        self.max_width = 0
+
+        if page_count:
+            # Unread pages are assumed to look like the first one
+            first = document[0]
+            self.widths = array("f", [first.rect.width]) * page_count
+            self.heights = array("f", [first.rect.height]) * page_count
+            self.rotations[0] = first.rotation
+            self.known[0] = 1
+        self.max_point_width = max(self.widths, default=0)
+        self.measure_next(page_count if measured_pages is None else measured_pages)
+
+    def __len__(self):
+        return len(self.heights)
+
+    @property
+    def nbytes(self):
+        arrays = (self.widths, self.heights, self.rotations, self.offsets)
+        return sum(values.itemsize * len(values) for values in arrays) + len(self.known)
+
+    @property
+    def complete(self):
+        return self.next_unknown >= len(self.heights)
+
+    def measure(self, pages):
+        """Read the real size of any of `pages` not read yet; returns True if the layout changed."""
+        first_changed = None
+        for i in pages:
+            if self.known[i]:
+                continue
+            page = self.document[i]
+            width, height = self.widths[i], self.heights[i]
+            self.widths[i] = page.rect.width
+            self.heights[i] = page.rect.height
+            self.rotations[i] = page.rotation
+            self.known[i] = 1
+            if (self.widths[i], self.heights[i]) != (width, height) and (first_changed is None or i < first_changed):
+                first_changed = i
+        while self.next_unknown < len(self.known) and self.known[self.next_unknown]:
+            self.next_unknown += 1
+
+        if first_changed is None:
+            return False
+        self.max_point_width = max(self.widths)
+        if self.zoom_factor is not None:
+            self.max_width = int(self.max_point_width * self.zoom_factor)
+            self.update_offsets(first_changed)
+        return True
+
+    def measure_next(self, count):
+        """Read up to `count` more pages in document order; returns True if the layout changed."""
+        end = min(len(self.known), self.next_unknown + count)
+        return self.measure(range(self.next_unknown, end))
+
+    def set_zoom(self, zoom_factor):
+        """Recompute the cumulative page offsets for `zoom_factor`."""
+        if zoom_factor == self.zoom_factor:
+            return
+        self.zoom_factor = zoom_factor
+        self.max_width = int(self.max_point_width * zoom_factor)
+        self.offsets[0] = self.margin
+        self.update_offsets(0)
+
+    def update_offsets(self, first):
+        """Recompute the offsets of the pages after `first`, whose own top is already right."""
+        zoom_factor = self.zoom_factor
+        offset = self.offsets[first]
+        for i in range(first, len(self.heights)):
+            self.offsets[i] = offset
+            offset += int(self.heights[i] * zoom_factor) + self.spacing
+        self.offsets[len(self.heights)] = offset - self.spacing + self.margin if self.heights else offset
+
+    def page_size(self, page_number, zoom_factor=None):
+        """Size in pixels of a page at `zoom_factor` (the table's current zoom by default)."""
+        zoom_factor = zoom_factor or self.zoom_factor
+        return QSize(int(self.widths[page_number] * zoom_factor), int(self.heights[page_number] * zoom_factor))
+
+    def page_top(self, page_number):
+        return self.offsets[page_number]
+
+    def page_bottom(self, page_number):
+        return self.offsets[page_number] + int(self.heights[page_number] * self.zoom_factor)
+
+    def page_at(self, y):
+        """Index of the last page whose top edge is at or above `y` (binary search)."""
+        return max(0, bisect_right(self.offsets, y, 0, len(self.heights)) - 1)
+
+    def pages_in_range(self, top, bottom):
+        """Pages intersecting the vertical span [top, bottom], found in O(log n)."""
+        if not self.heights:
+            return range(0)
+        first = self.page_at(top)
+        if self.page_bottom(first) < top:
+            first += 1  # `top` falls into the spacing below this page
+        last = self.page_at(bottom)
+        return range(first, last + 1)
+
+    def nearest_page(self, y):
+        """Page whose center is closest to `y`."""
+        page = self.page_at(y)
+        candidates = [i for i in (page - 1, page, page + 1) if 0 <= i < len(self.heights)]
+        return min(candidates, key=lambda i: abs((self.page_top(i) + self.page_bottom(i)) // 2 - y))
+
+    def total_height(self):
+        return self.offsets[len(self.heights)]
+
+
+class ScrollMotion:
+    """Smoothed scroll velocity in pixels per second (positive = down) from successive positions."""
+
+    smoothing = 0.5
+    stale_after = 0.25  # seconds between samples after which the motion counts as stopped
 
-class PDFViewer(QMainWindow):
     def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.position = None
+        self.time = None
+        self.velocity = 0.0
+
+    def update(self, position, now=None):
+        now = time.perf_counter() if now is None else now
+        if self.position is not None and now > self.time:
+            elapsed = now - self.time
+            if elapsed > self.stale_after:
+                self.velocity = 0.0
+            else:
+                instant = (position - self.position) / elapsed
+                self.velocity = self.smoothing * instant + (1 - self.smoothing) * self.velocity
+        self.position = position
+        self.time = now
+        return self.velocity
+
+    def current(self, now=None):
+        """The velocity, or 0 once no position has arrived for `stale_after` seconds."""
+        now = time.perf_counter() if now is None else now
+        if self.time is None or now - self.time > self.stale_after:
+            return 0.0
+        return self.velocity
+
+
+class PageSlot:
+    """Render state of one on-screen page: a whole-page pixmap and, at high zoom, tiles on top of it.
+
+    Pixmaps are rendered at zoom pyramid levels and scaled by the painter to the
+    page's display rectangle, so zooming within a level needs no new render.
+    Slots are recycled by PageView as pages scroll in and out of view.
+    """
+
+    def __init__(self, view):
+        self.view = view
+        self.reset(None)
+
+    def reset(self, page_number):
+        self.page_number = page_number
+        self.page_pixmap = None
+        self.page_zoom = None
+        self.tiles = {}
+        self.tile_zoom = None
+        self.tile_scale = 1.0
+
+    def update(self, rect=None):
+        """Repaint the whole page, or `rect` in page coordinates."""
+        self.view.update_page(self.page_number, rect)
+
+    def set_page_pixmap(self, pixmap, zoom_factor=None):
+        """Show a whole-page render rendered at `zoom_factor` and drop any tiles."""
+        self.page_pixmap = pixmap
+        self.page_zoom = zoom_factor
+        self.clear_tiles()
+        self.update()
+
+    def release_pixmap(self, pixmap):
+        """Stop showing `pixmap` if it is the current page pixmap."""
+        if self.page_pixmap is not None and self.page_pixmap.cacheKey() == pixmap.cacheKey():
+            self.page_pixmap = None
+            self.page_zoom = None
+            self.update()
+
+    def set_preview(self, pixmap):
+        """Stretch a low-resolution preview over a still blank page."""
+        if self.page_zoom is not None:
+            return
+        self.page_pixmap = pixmap
+        self.update()
+
+    def set_tiled(self, zoom_factor, scale=1.0):
+        """Switch to tiles rendered at `zoom_factor` and drawn at `scale`; the last full render
+        stays as a stretched backdrop."""
+        if self.tile_zoom != zoom_factor:
+            self.view.forget_pixmaps(list(self.tiles.values()))
+            self.tiles.clear()
+            self.tile_zoom = zoom_factor
+        if self.tile_scale != scale:
+            self.tile_scale = scale
+            self.update()
+
+    def has_tile(self, tile):
+        return tile in self.tiles
+
+    def tile_rect(self, tile, size=None):
+        """Page-space rectangle covered by a tile."""
+        column, row = tile
+        width, height = (size.width(), size.height()) if size else (TILE_SIZE, TILE_SIZE)
+        rect = QRectF(column * TILE_SIZE, row * TILE_SIZE, width, height)
+        return QRectF(rect.topLeft() * self.tile_scale, rect.size() * self.tile_scale).toAlignedRect()
+
+    def set_tile(self, tile, zoom_factor, pixmap):
+        if zoom_factor != self.tile_zoom:
+            return
+        self.tiles[tile] = pixmap
+        self.update(self.tile_rect(tile, pixmap.size()))
+
+    def retain_tiles(self, area):
+        """Drop the tiles outside `area` (pixels of the tile level); they stay in the pixmap cache."""
+        dropped = [tile for tile, pixmap in self.tiles.items()
+                   if not area.intersects(QRect(tile[0] * TILE_SIZE, tile[1] * TILE_SIZE, pixmap.width(), pixmap.height()))]
+        if dropped:
+            self.view.forget_pixmaps([self.tiles.pop(tile) for tile in dropped])
+
+    def clear_tiles(self):
+        """Leave tiled mode and drop the tiles; they stay in the pixmap cache."""
+        if self.tile_zoom is None and not self.tiles:
+            return
+        self.view.forget_pixmaps(list(self.tiles.values()))
+        self.tiles.clear()
+        self.tile_zoom = None
+        self.tile_scale = 1.0
+        self.update()
+
+    def release_tile(self, tile, zoom_factor):
+        if zoom_factor == self.tile_zoom and self.tiles.pop(tile, None) is not None:
+            self.update(self.tile_rect(tile))
+
+    def paint(self, painter, page_rect, exposed):
+        """Paint into `page_rect` (viewport coordinates), limited to the `exposed` part of it."""
+        target = exposed.intersected(page_rect)
+        if self.page_pixmap is None or self.page_pixmap.isNull():
+            painter.fillRect(target, Qt.white)
+        elif self.page_pixmap.size() == page_rect.size():
+            painter.drawPixmap(target, self.page_pixmap, target.translated(-page_rect.topLeft()))
+        else:
+            # Only scale the part of the page that is being repainted
+            scale_x = self.page_pixmap.width() / max(1, page_rect.width())
+            scale_y = self.page_pixmap.height() / max(1, page_rect.height())
+            local = target.translated(-page_rect.topLeft())
+            source = QRectF(local.x() * scale_x, local.y() * scale_y,
+                            local.width() * scale_x, local.height() * scale_y)
+            painter.drawPixmap(QRectF(target), self.page_pixmap, source)
+
+        if self.tiles:
+            local = target.translated(-page_rect.topLeft())
+            painter.save()
+            painter.translate(page_rect.topLeft())
+            painter.scale(self.tile_scale, self.tile_scale)
+            for tile, pixmap in self.tiles.items():
+                if local.intersects(self.tile_rect(tile, pixmap.size())):
+                    column, row = tile
+                    painter.drawPixmap(QPoint(column * TILE_SIZE, row * TILE_SIZE), pixmap)
+            painter.restore()
+
+
+class PageView(QAbstractScrollArea):
+    """Virtualized continuous page view.
+
+    Only the pages intersecting the viewport are painted, straight from the
+    PageGeometry table; their render state lives in a small pool of recycled
+    PageSlot objects, and scrolling blits the viewport instead of moving widgets.
+    Open and scroll cost do not depend on the page count.
+    """
+
+    background = QColor(231, 236, 241)
+
+    def __init__(self, parent=None, spacing=20, margin=9, stats=None):
+        super().__init__(parent)
+        self.stats = stats
+        self.spacing = spacing
+        self.margin = margin
+        self.geometry_table = None
+        self.slots = OrderedDict()  # page_number -> PageSlot, least recently used first
+        self.free_slots = []
+        self.pinned_pages = set()
+        self.interactive = False
+        self.viewport().setAttribute(Qt.WA_OpaquePaintEvent)
+        self.verticalScrollBar().setSingleStep(20)
+        self.horizontalScrollBar().setSingleStep(20)
+
+    def set_page_geometry(self, geometry):
+        """Show a new document; every slot goes back to the pool."""
+        self.geometry_table = geometry
+        for slot in self.slots.values():
+            slot.reset(None)
+            self.free_slots.append(slot)
+        self.slots.clear()
+        self.pinned_pages.clear()
+        self.refresh()
+
+    def set_interactive(self, interactive):
+        """Scale pixmaps with the fast (nearest neighbour) transform while a gesture is under way."""
+        if interactive != self.interactive:
+            self.interactive = interactive
+            self.viewport().update()
+
+    def refresh(self):
+        """Recompute scroll ranges after the geometry (zoom) changed and repaint."""
+        self.update_scrollbars()
+        self.viewport().update()
+
+    def content_width(self):
+        if self.geometry_table is None:
+            return 0
+        return self.geometry_table.max_width + 2 * self.margin
+
+    def update_scrollbars(self):
+        viewport_size = self.viewport().size()
+        total_height = self.geometry_table.total_height() if self.geometry_table else 0
+        vertical = self.verticalScrollBar()
+        vertical.setPageStep(viewport_size.height())
+        vertical.setRange(0, max(0, total_height - viewport_size.height()))
+        horizontal = self.horizontalScrollBar()
+        horizontal.setPageStep(viewport_size.width())
+        horizontal.setRange(0, max(0, self.content_width() - viewport_size.width()))
+
+    def page_rect(self, page_number):
+        """Rectangle of a page in viewport coordinates."""
+        size = self.geometry_table.page_size(page_number)
+        content_width = max(self.content_width(), self.viewport().width())
+        x = (content_width - size.width()) // 2 - self.horizontalScrollBar().value()
+        y = self.geometry_table.page_top(page_number) - self.verticalScrollBar().value()
+        return QRect(x, y, size.width(), size.height())
+
+    def visible_pages(self):
+        if self.geometry_table is None:
+            return range(0)
+        top = self.verticalScrollBar().value()
+        return self.geometry_table.pages_in_range(top, top + self.viewport().height())
+
+    def slot(self, page_number):
+        """Slot for a page, taking a free or least recently used unpinned slot if it has none."""
+        slot = self.slots.pop(page_number, None)
+        if slot is None:
+            if self.free_slots:
+                slot = self.free_slots.pop()
+            elif len(self.slots) >= max(PAGE_SLOT_POOL, len(self.pinned_pages)):
+                victim = next((page for page in self.slots if page not in self.pinned_pages), None)
+                slot = self.slots.pop(victim) if victim is not None else PageSlot(self)
+            else:
+                slot = PageSlot(self)
+            slot.reset(page_number)
+        self.slots[page_number] = slot
+        return slot
+
+    def existing_slot(self, page_number):
+        return self.slots.get(page_number)
+
+    def set_pinned_pages(self, pages):
+        """Pages whose slots must not be recycled (the ones being shown or prefetched)."""
+        self.pinned_pages = set(pages)
+
+    def forget_pixmap(self, pixmap):
+        """`pixmap` left the pixmap cache; the raster view keeps nothing derived from it."""
+
+    def forget_pixmaps(self, pixmaps):
+        """A slot stopped showing `pixmaps`."""
+        for pixmap in pixmaps:
+            self.forget_pixmap(pixmap)
+
+    def compositor_stats(self):
+        return {"compositor": "raster"}
+
+    def update_page(self, page_number, rect=None):
+        if page_number is None or self.geometry_table is None:
+            return
+        page_rect = self.page_rect(page_number)
+        if rect is not None:
+            page_rect = rect.translated(page_rect.topLeft()).intersected(page_rect)
+        if page_rect.intersects(self.viewport().rect()):
+            self.viewport().update(page_rect)
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().scroll(dx, dy)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scrollbars()
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        painter = QPainter(self.viewport())
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, not self.interactive)
+        exposed = event.rect()
+        painter.fillRect(exposed, self.background)
+
+        for page_number in self.visible_pages():
+            page_rect = self.page_rect(page_number)
+            if not page_rect.intersects(exposed):
+                continue
+            slot = self.slots.get(page_number)
+            if slot is not None:
+                slot.paint(painter, page_rect, exposed)
+            else:
+                painter.fillRect(exposed.intersected(page_rect), Qt.white)
+        painter.end()
+        if self.stats is not None:
+            self.stats.record("paint", time.perf_counter() - start)
+
+
+def opengl_available():
+    """True if an OpenGL context can be created on this platform."""
+    return QOpenGLContext().create()
+
+
+class TextureCache:
+    """GPU textures of rendered pixmaps keyed by QPixmap.cacheKey(), bounded by a byte budget.
+
+    Each pixmap is uploaded once and then only drawn. Everything except
+    `release` must run with the view's GL context current.
+    """
+
+    def __init__(self, budget=TEXTURE_CACHE_BUDGET):
+        self.budget = budget
+        self.textures = OrderedDict()  # cacheKey -> (QOpenGLTexture, bytes), least recently drawn first
+        self.total_bytes = 0
+        self.released = []  # textures to destroy once the context is current again
+        self.uploads = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.textures)
+
+    def texture(self, pixmap):
+        """The texture for `pixmap`, uploading it on first use."""
+        key = pixmap.cacheKey()
+        entry = self.textures.get(key)
+        if entry is not None:
+            self.textures.move_to_end(key)
+            return entry[0]
+        texture = QOpenGLTexture(pixmap.toImage(), QOpenGLTexture.DontGenerateMipMaps)
+        texture.setWrapMode(QOpenGLTexture.ClampToEdge)
+        nbytes = pixmap.width() * pixmap.height() * 4
+        self.textures[key] = (texture, nbytes)
+        self.total_bytes += nbytes
+        self.uploads += 1
+        return texture
+
+    def release(self, key):
+        """Drop the texture of a pixmap that is gone; it is destroyed at the next trim."""
+        entry = self.textures.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+            self.released.append(entry[0])
+
+    def release_all(self):
+        for key in list(self.textures):
+            self.release(key)
+
+    def trim(self, keep=()):
+        """Destroy released textures, then evict least recently drawn ones (except `keep`) down to the budget."""
+        for texture in self.released:
+            texture.destroy()
+        self.released.clear()
+        for key in list(self.textures):
+            if self.total_bytes <= self.budget:
+                break
+            if key in keep:
+                continue
+            texture, nbytes = self.textures.pop(key)
+            texture.destroy()
+            self.total_bytes -= nbytes
+            self.evictions += 1
+            cache_log.debug("Evicted texture (%d bytes), %d bytes left", nbytes, self.total_bytes)
+
+    def clear(self):
+        self.release_all()
+        self.trim()
+
+    def stats(self):
+        return {
+            "entries": len(self.textures),
+            "bytes_used": self.total_bytes,
+            "budget": self.budget,
+            "uploads": self.uploads,
+            "evictions": self.evictions,
+        }
+
+
+class GLPageView(PageView):
+    """PageView composited with OpenGL.
+
+    Rendered pages and tiles are uploaded once into a TextureCache; a frame
+    only draws one textured quad per page or tile, so scrolling and zooming
+    move vertices instead of repainting pixels.
+    """
+
+    vertex_shader = """
+        attribute highp vec2 position;
+        attribute highp vec2 texcoord;
+        uniform highp mat4 projection;
+        varying highp vec2 uv;
+        void main() {
+            uv = texcoord;
+            gl_Position = projection * vec4(position, 0.0, 1.0);
+        }
+    """
+    fragment_shader = """
+        uniform sampler2D page;
+        varying highp vec2 uv;
+        void main() {
+            gl_FragColor = texture2D(page, uv);
+        }
+    """
+    corners = [QVector2D(0, 0), QVector2D(1, 0), QVector2D(0, 1), QVector2D(1, 1)]
+
+    def __init__(self, parent=None, spacing=20, margin=9, stats=None, texture_budget=TEXTURE_CACHE_BUDGET):
+        super().__init__(parent, spacing, margin, stats)
+        self.textures = TextureCache(texture_budget)
+        self.gl = None
+        self.program = None
+        self.max_texture_size = 0
+        self.setViewport(QOpenGLWidget())
+        self.viewport().setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def set_page_geometry(self, geometry):
+        self.textures.release_all()
+        super().set_page_geometry(geometry)
+
+    def forget_pixmap(self, pixmap):
+        self.textures.release(pixmap.cacheKey())
+
+    def compositor_stats(self):
+        return dict(self.textures.stats(), compositor="opengl")
+
+    def scrollContentsBy(self, dx, dy):
+        # A GL frame is always drawn whole; there is nothing to blit
+        self.viewport().update()
+
+    def init_gl(self):
+        """Resolve GL functions and build the quad shader in the current context; False if unusable."""
+        context = QOpenGLContext.currentContext()
+        if context is not None:
+            context.aboutToBeDestroyed.connect(self.release_gl)
+            profile = QOpenGLVersionProfile()
+            profile.setVersion(2, 0)
+            self.gl = context.versionFunctions(profile)
+        if not self.gl:
+            log.warning("OpenGL 2.0 functions are unavailable, painting pages with QPainter")
+            self.gl = False
+            return False
+        self.gl.initializeOpenGLFunctions()
+        self.program = QOpenGLShaderProgram(self)
+        if not (self.program.addShaderFromSourceCode(QOpenGLShader.Vertex, self.vertex_shader)
+                and self.program.addShaderFromSourceCode(QOpenGLShader.Fragment, self.fragment_shader)
+                and self.program.link()):
+            log.warning("Could not build the page shader: %s", self.program.log())
+            self.gl = False
+            return False
+        max_size = self.gl.glGetIntegerv(GL_MAX_TEXTURE_SIZE)
+        self.max_texture_size = max_size[0] if isinstance(max_size, (tuple, list)) else int(max_size)
+        log.info("OpenGL compositor ready, max texture size %d", self.max_texture_size)
+        return True
+
+    def release_gl(self):
+        """The GL context is going away: free every texture and the shader with it."""
+        self.viewport().makeCurrent()
+        self.textures.clear()
+        self.program = None
+        self.gl = None
+        self.viewport().doneCurrent()
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        painter = QPainter(self.viewport())
+        viewport = self.viewport().rect()
+        painter.fillRect(viewport, self.background)
+
+        quads = []  # (pixmap, target rectangle in viewport coordinates), back to front
+        for page_number in self.visible_pages():
+            page_rect = self.page_rect(page_number)
+            slot = self.slots.get(page_number)
+            if slot is None or slot.page_pixmap is None or slot.page_pixmap.isNull():
+                painter.fillRect(page_rect, Qt.white)
+            else:
+                quads.append((slot.page_pixmap, QRectF(page_rect)))
+            if slot is not None:
+                for tile, pixmap in slot.tiles.items():
+                    tile_rect = slot.tile_rect(tile, pixmap.size()).translated(page_rect.topLeft())
+                    if tile_rect.intersects(viewport):
+                        quads.append((pixmap, QRectF(tile_rect)))
+
+        painter.beginNativePainting()
+        try:
+            leftover = self.draw_quads(quads, viewport.size())
+        finally:
+            painter.endNativePainting()
+        if leftover:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, not self.interactive)
+            for pixmap, target in leftover:
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+        painter.end()
+        if self.stats is not None:
+            self.stats.record("paint", time.perf_counter() - start)
+
+    def draw_quads(self, quads, size):
+        """Draw textured quads; returns those that cannot be textures (too large, or no usable GL)."""
+        if self.gl is None:
+            self.init_gl()
+        if not self.gl:
+            return quads
+
+        projection = QMatrix4x4()
+        projection.ortho(0, size.width(), size.height(), 0, -1, 1)
+        texture_filter = QOpenGLTexture.Nearest if self.interactive else QOpenGLTexture.Linear
+        program = self.program
+        program.bind()
+        program.setUniformValue("projection", projection)
+        program.setUniformValue("page", 0)
+        position = program.attributeLocation("position")
+        texcoord = program.attributeLocation("texcoord")
+        program.enableAttributeArray(position)
+        program.enableAttributeArray(texcoord)
+        program.setAttributeArray(texcoord, self.corners)
+
+        leftover = []
+        drawn = set()
+        uploads = self.textures.uploads
+        upload_start = time.perf_counter()
+        for pixmap, target in quads:
+            if max(pixmap.width(), pixmap.height()) > self.max_texture_size:
+                leftover.append((pixmap, target))
+                continue
+            texture = self.textures.texture(pixmap)
+            drawn.add(pixmap.cacheKey())
+            texture.setMinMagFilters(texture_filter, texture_filter)
+            texture.bind(0)
+            program.setAttributeArray(position, [
+                QVector2D(target.left(), target.top()), QVector2D(target.right(), target.top()),
+                QVector2D(target.left(), target.bottom()), QVector2D(target.right(), target.bottom()),
+            ])
+            self.gl.glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+            texture.release(0)
+
+        program.disableAttributeArray(position)
+        program.disableAttributeArray(texcoord)
+        program.release()
+        if self.stats is not None and self.textures.uploads != uploads:
+            self.stats.record("texture", time.perf_counter() - upload_start)
+        self.textures.trim(drawn)
+        return leftover
+
+
+class StatsDock(QDockWidget):
+    """Dock showing live render pipeline statistics, refreshed while visible."""
+
+    def __init__(self, collect, parent=None):
+        super().__init__("Render Stats", parent)
+        self.setObjectName("render_stats")
+        self.collect = collect
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.setWidget(self.text)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(STATS_REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self.on_visibility_changed)
+
+    def on_visibility_changed(self, visible):
+        if visible:
+            self.refresh()
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+    def refresh(self):
+        self.text.setPlainText(self.format(self.collect()))
+
+    @staticmethod
+    def format(snapshot):
+        queue = snapshot["queue"]
+        lines = [
+            f"workers   {queue['workers']} ({queue['backend']})",
+            f"queued    {queue['queued']}",
+            f"in flight {queue['in_flight']} (+{queue['cancelled_in_flight']} cancelled)",
+            "",
+            f"{'stage':<11}{'count':>7}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)",
+        ]
+        for stage, histogram in snapshot["stages"].items():
+            lines.append(
+                f"{stage:<11}{histogram['count']:>7}{histogram['mean_ms']:>9.2f}{histogram['p50_ms']:>9.2f}"
+                f"{histogram['p90_ms']:>9.2f}{histogram['p99_ms']:>9.2f}{histogram['max_ms']:>9.2f}"
+            )
+        lines.append("")
+        lines.extend(f"{name:<11}{value:>7}" for name, value in snapshot["counters"].items())
+        compositor = snapshot.get("compositor")
+        if compositor is not None and compositor["compositor"] == "opengl":
+            lines.append("")
+            lines.append(f"textures: {compositor['entries']} entries, "
+                         f"{compositor['bytes_used'] / 2**20:.1f} / {compositor['budget'] / 2**20:.0f} MB")
+            lines.append(f"  uploads {compositor['uploads']}  evictions {compositor['evictions']}")
+        memory = snapshot.get("memory")
+        if memory is not None and memory["rss_bytes"] is not None:
+            lines.append("")
+            lines.append(f"memory: {memory['rss_bytes'] / 2**20:.1f} MB resident ({memory['open_mode']} open mode)")
+            if memory["mapped_bytes"] is not None:
+                lines.append(f"  document {memory['mapped_resident_bytes'] / 2**20:.1f} of "
+                             f"{memory['mapped_bytes'] / 2**20:.1f} MB mapped resident")
+        for name in ("pixmap_cache", "disk_cache"):
+            cache = snapshot.get(name)
+            if cache is None:
+                continue
+            ratio = "-" if cache["hit_ratio"] is None else f"{cache['hit_ratio']:.1%}"
+            lines.append("")
+            lines.append(f"{name}: {cache['entries']} entries, "
+                         f"{cache['bytes_used'] / 2**20:.1f} / {cache['budget'] / 2**20:.0f} MB")
+            lines.append(f"  hits {cache['hits']}  misses {cache['misses']}  ratio {ratio}")
+        return "\n".join(lines)
+
+
+class PDFViewer(QMainWindow):
+    def __init__(self, compositor=None):
         super().__init__()
         self.setWindowTitle("PDF Viewer - Debug Mode")
         self.resize(1024, 768)
 
         # Initial state
         self.current_document = None
+        self.document_loader = None
+        self.document_repaired_path = None  # repaired copy the current document was opened from
+        self.document_mapping = None  # MappedFile of the current document in the "mmap" open mode
+        self.document_id = 0
+        self.render_generation = 0
         self.zoom_factor = 1.0
         self.page_spacing = 20
-        self.page_widgets = []
-        self.page_positions = []
-        self.render_threads = []
-        self.rendering_queue = []
-        self.rendering_in_progress = set()
-        self.render_mutex = QMutex()
+        self.page_geometry = None
         self.last_scroll_value = 0
+        self.adjusting_scroll = False
+        self.scroll_motion = ScrollMotion()
+        self.render_seconds_per_mpx = None  # smoothed whole-page render cost
+        self.stats_file = STATS_FILE
 
-        # Scroll area
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.setCentralWidget(self.scroll_area)
+        # Rendered pixmaps, bounded by a byte budget
+        self.pixmap_cache = PixmapCache(on_evict=self.handle_pixmap_evicted)
 
-        # Content widget
-        self.content_widget = QWidget()
-        self.scroll_area.setWidget(self.content_widget)
-        self.content_layout = QVBoxLayout(self.content_widget)
-        self.content_layout.setSpacing(self.page_spacing)
-        self.content_layout.setAlignment(Qt.AlignHCenter)
+        # Render engine (fixed worker pool shared by every page)
+        self.render_engine = RenderEngine(parent=self)
+        self.render_engine.rendered.connect(self.handle_render_finished)
 
-        # Styling
-        self.content_widget.setStyleSheet("background-color: rgba(231,236,241,255); border: none;")
+        # Page view (paints only the pages in the viewport)
+        compositor = compositor or COMPOSITOR
+        view_class = PageView
+        if compositor == "opengl":
+            if opengl_available():
+                view_class = GLPageView
+            else:
+                log.warning("OpenGL is not available on this platform, using the raster compositor")
+        self.scroll_area = view_class(spacing=self.page_spacing, stats=self.render_engine.stats)
+        self.setCentralWidget(self.scroll_area)
 
         # Status bar
         self.status_bar = QStatusBar()
@@ -74,6 +2127,27 @@ class PDFViewer(QMainWindow):
 
         # Connect scroll event to page update
         self.scroll_area.verticalScrollBar().valueChanged.connect(self.handle_scroll)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self.handle_scroll)
+
+        # At most one scroll pass per display frame, run from the final scroll position
+        self.scroll_timer = QTimer(self)
+        self.scroll_timer.setSingleShot(True)
+        self.scroll_timer.setInterval(self.frame_interval())
+        self.scroll_timer.timeout.connect(self.update_visible_page)
+
+        # Zoom changes only relayout and rescale until the gesture settles
+        self.zoom_settle_timer = QTimer(self)
+        self.zoom_settle_timer.setSingleShot(True)
+        self.zoom_settle_timer.timeout.connect(self.reload_visible_pages_with_zoom)
+
+        # Background work (page size read-ahead, background renders) starts once the view is still
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.setInterval(BACKGROUND_IDLE_DELAY_MS)
+        self.idle_timer.timeout.connect(self.start_background_work)
+        self.geometry_timer = QTimer(self)
+        self.geometry_timer.setInterval(0)
+        self.geometry_timer.timeout.connect(self.measure_geometry_idle)
 
         # Zoom controls
         self.zoom_layout = QHBoxLayout()
@@ -81,6 +2155,7 @@ class PDFViewer(QMainWindow):
         self.zoom_slider.setRange(10, 5000)
         self.zoom_slider.setValue(100)
         self.zoom_slider.valueChanged.connect(self.on_zoom_slider_changed)
+        self.zoom_slider.sliderReleased.connect(self.on_zoom_slider_released)
 
         self.zoom_input = QLineEdit("100", self)
         self.zoom_input.setFixedWidth(60)
@@ -95,6 +2170,23 @@ class PDFViewer(QMainWindow):
         zoom_container.setLayout(self.zoom_layout)
         self.status_bar.addPermanentWidget(zoom_container)
 
+        # Progress of a document being opened in the background
+        self.open_label = QLabel()
+        self.open_progress = QProgressBar()
+        self.open_progress.setRange(0, 0)  # MuPDF reports no progress, so it is a busy indicator
+        self.open_progress.setMaximumWidth(120)
+        self.open_cancel_button = QPushButton("Cancel")
+        self.open_cancel_button.clicked.connect(self.cancel_open)
+        self.open_widgets = (self.open_label, self.open_progress, self.open_cancel_button)
+        for widget in self.open_widgets:
+            self.status_bar.addWidget(widget)
+            widget.hide()
+
+        # Render statistics, hidden until toggled from the View menu
+        self.stats_dock = StatsDock(self.collect_stats, self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.stats_dock)
+        self.stats_dock.hide()
+
         # Menu
         self.init_menu()
 
@@ -106,32 +2198,92 @@ class PDFViewer(QMainWindow):
         open_action.setShortcut("Ctrl+O")
         open_action.triggered.connect(self.open_pdf)
 
+        export_stats_action = file_menu.addAction("Export Render Stats...")
+        export_stats_action.triggered.connect(self.export_stats)
+
+        view_menu = menu.addMenu("View")
+        stats_action = self.stats_dock.toggleViewAction()
+        stats_action.setShortcut("Ctrl+Shift+S")
+        view_menu.addAction(stats_action)
+
     def open_pdf(self):
         file_name, _ = QFileDialog.getOpenFileName(self, "Open PDF", "", "PDF Files (*.pdf)")
         if file_name:
-            print(f"[DEBUG] Opening PDF file: {file_name}")
+            log.info("Opening PDF file: %s", file_name)
+            self.cancel_open()
+            loader = DocumentLoader(file_name, self)
+            loader.progress.connect(self.open_label.setText)
+            loader.loaded.connect(lambda document: self.handle_document_loaded(loader, document))
+            loader.failed.connect(lambda error: self.handle_document_failed(loader, error))
+            loader.finished.connect(loader.deleteLater)
+            self.document_loader = loader
+            for widget in self.open_widgets:
+                widget.show()
+            loader.start()
+
+    def cancel_open(self):
+        """Stop waiting for the document being opened; the current one stays on screen."""
+        if self.document_loader is None:
+            return
+        self.document_loader.cancel()
+        self.document_loader = None
+        for widget in self.open_widgets:
+            widget.hide()
+        self.status_bar.showMessage("Open cancelled", 3000)
+
+    def finish_open(self, loader):
+        """True if `loader` is the open still being waited for; hides the progress either way."""
+        if loader is not self.document_loader:
+            return False
+        self.document_loader = None
+        for widget in self.open_widgets:
+            widget.hide()
+        return True
+
+    def discard_repaired_document(self):
+        """Delete the repaired copy of the current document; the workers have reopened something else."""
+        if self.document_repaired_path is not None:
             try:
-                self.current_document = fitz.open(file_name)
-            except Exception as e:
-                print(f"[ERROR] Failed to open PDF: {e}")
-                return
+                os.remove(self.document_repaired_path)
+            except OSError:
+                pass
+            self.document_repaired_path = None
 
-            # Reset state
-            for i in reversed(range(self.content_layout.count())):
-                widget = self.content_layout.itemAt(i).widget()
-                if widget:
-                    widget.deleteLater()
+    def handle_document_failed(self, loader, error):
+        if self.finish_open(loader):
+            log.error("Failed to open PDF: %s", error)
+            self.status_bar.showMessage(f"Could not open {os.path.basename(loader.path)}: {error}", 5000)
 
-            self.page_widgets.clear()
-            self.page_positions.clear()
-            self.render_threads.clear()
-            self.rendering_queue.clear()
-            self.rendering_in_progress.clear()
-            self.zoom_factor = 1.0
-            self.zoom_slider.setValue(100)
-            self.zoom_input.setText("100")
+    def handle_document_loaded(self, loader, document):
+        """Install a document opened in the background, unless that open was cancelled or superseded."""
+        if not self.finish_open(loader):
+            close_document(document, loader.mapping)
+            loader.discard_repaired()
+            return
+        previous, previous_mapping = self.current_document, self.document_mapping
+        self.current_document = document
+        self.document_mapping = loader.mapping
+        self.render_engine.set_document(loader.source, loader.path)
+        self.discard_repaired_document()
+        self.document_repaired_path = loader.repaired_path
+        self.document_id += 1
+        self.render_generation += 1
+
+        # Reset state
+        self.geometry_timer.stop()
+        self.idle_timer.stop()
+        self.scroll_motion.reset()
+        self.page_geometry = None
+        self.pixmap_cache.clear()
+        self.zoom_factor = 1.0
+        self.zoom_slider.setValue(100)
+        self.zoom_input.setText("100")
+        self.zoom_settle_timer.stop()
+        self.scroll_area.set_interactive(False)
 
-            self.load_pages()
+        self.load_pages()
+        if previous is not None:
+            close_document(previous, previous_mapping)
 
     def load_pages(self):
         """Load pages and create placeholders."""
@@ -139,128 +2291,657 @@ class PDFViewer(QMainWindow):
             return
 
         total_pages = len(self.current_document)
-        print(f"[DEBUG] Total pages in document: {total_pages}")
+        layout_log.debug("Total pages in document: %d", total_pages)
         self.page_label.setText(f"Page: 1/{total_pages}")
 
-        for i in range(total_pages):
-            label = QLabel()
-            label.setAlignment(Qt.AlignCenter)
-            self.content_layout.addWidget(label)
-            self.page_widgets.append(label)
-            self.page_positions.append(QPoint(0, 0))  # Placeholder for page positions
+        # Only the first pages are measured now; the first screen does not wait for the rest
+        self.page_geometry = PageGeometry(self.current_document, self.page_spacing, self.scroll_area.margin,
+                                          GEOMETRY_OPEN_PAGES)
+        self.page_geometry.set_zoom(self.zoom_factor)
+        layout_log.debug("Page geometry table uses %d bytes", self.page_geometry.nbytes)
+        self.scroll_area.set_page_geometry(self.page_geometry)
+        self.scroll_area.verticalScrollBar().setValue(0)
 
         self.update_visible_page()
-        self.queue_render_visible_pages()
 
-    def update_visible_page(self):
-        """Update the page number indicator based on the currently visible page."""
-        if not self.page_widgets or not self.current_document:
-            return
+    def measure_pages(self, pages):
+        """Read the real size of `pages`, keeping the page at the top of the viewport in place.
 
+        Returns True if the layout changed; the caller is responsible for the visibility pass.
+        """
+        geometry = self.page_geometry
         scroll_bar = self.scroll_area.verticalScrollBar()
-        scroll_center = scroll_bar.value() + self.scroll_area.height() // 2
+        anchor = geometry.page_at(scroll_bar.value())
+        anchor_offset = scroll_bar.value() - geometry.page_top(anchor)
+        if not geometry.measure(pages):
+            return False
+        self.adjusting_scroll = True
+        try:
+            self.scroll_area.refresh()
+            scroll_bar.setValue(geometry.page_top(anchor) + anchor_offset)
+        finally:
+            self.adjusting_scroll = False
+        return True
+
+    def start_background_work(self):
+        """The view has been still for a while: queue background renders and read page sizes ahead."""
+        self.update_visible_page(background=True)
+        if self.page_geometry is not None and not self.page_geometry.complete:
+            self.geometry_timer.start()
+
+    def measure_geometry_idle(self):
+        """Read the next chunk of page sizes; runs from a zero-interval timer until every page is known."""
+        geometry = self.page_geometry
+        if geometry is None or geometry.complete:
+            self.geometry_timer.stop()
+            return
+        first = geometry.next_unknown
+        if self.measure_pages(range(first, min(len(geometry), first + GEOMETRY_IDLE_CHUNK_PAGES))):
+            self.update_visible_page(background=True)
+        if geometry.complete:
+            self.geometry_timer.stop()
+            layout_log.debug("Measured all %d pages", len(geometry))
+
+    def update_visible_page(self, background=False):
+        """Update the page number indicator and schedule renders for the current position.
 
-        closest_page = 0
-        closest_distance = float('inf')
-        for i, widget in enumerate(self.page_widgets):
-            widget_top = widget.pos().y()
-            widget_bottom = widget_top + widget.height()
-            widget_center = (widget_top + widget_bottom) // 2
+        Passes driven by scrolling or zooming (the default) pause background work
+        and restart the idle countdown; `background` passes also queue it.
+        """
+        self.scroll_timer.stop()
+        if not background:
+            self.geometry_timer.stop()
+            self.idle_timer.start()
+        if not self.page_geometry or not self.current_document:
+            return
+
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        if not background:
+            self.scroll_motion.update(scroll_bar.value())
+        if not self.page_geometry.complete:
+            # Pages about to be shown get their real size before anything is scheduled for them
+            visible = self.get_visible_pages()
+            if visible:
+                self.measure_pages(range(max(0, visible[0] - PREFETCH_PAGES),
+                                         min(len(self.page_geometry), visible[-1] + PREFETCH_PAGES + 1)))
 
-            distance = abs(widget_center - scroll_center)
-            if distance < closest_distance:
-                closest_distance = distance
-                closest_page = i
+        scroll_center = scroll_bar.value() + self.scroll_area.viewport().height() // 2
+        closest_page = self.page_geometry.nearest_page(scroll_center)
 
         total_pages = len(self.current_document)
         self.page_label.setText(f"Page: {closest_page + 1}/{total_pages}")
-        print(f"[DEBUG] Currently visible page: {closest_page + 1}")
+        layout_log.debug("Currently visible page: %d", closest_page + 1)
 
-        self.queue_render_visible_pages()
+        if self.zoom_settle_timer.isActive():
+            return  # mid zoom gesture; the settle pass schedules renders
+        self.queue_render_visible_pages(background)
 
-    def queue_render_visible_pages(self):
-        """Queue rendering of only the visible pages."""
+    def queue_render_visible_pages(self, background=False):
+        """Schedule the visible pages, then prefetch around them (stretched ahead
+        of the scroll motion), then (for `background` passes) exact-zoom renders of
+        the visible pages and pages further away at idle priority."""
         if not self.current_document:
             return
 
-        with QMutexLocker(self.render_mutex):
-            visible_pages = self.get_visible_pages()
-            self.rendering_queue = [page for page in visible_pages if page not in self.rendering_in_progress]
+        start = time.perf_counter()
+        visible_pages = self.get_visible_pages()
+
+        layers = {page: RENDER_LAYER_VISIBLE for page in visible_pages}
+        prefetch = range(0)
+        if visible_pages:
+            prefetch = self.prefetch_range(visible_pages[0], visible_pages[-1], self.render_zoom())
+            for page in prefetch:
+                layers.setdefault(page, RENDER_LAYER_PREFETCH)
+
+        viewport_center = self.scroll_area.viewport().rect().center()
+
+        self.scroll_area.set_pinned_pages(layers)
+
+        # Rebuild the whole queue so pages that scrolled away are dropped or cancelled
+        render_zoom = self.render_zoom()
+        exact_zoom = round(self.zoom_factor, 6)
+        requests = []
+        # Cache keys of the whole pages, previews and tiles these pages show or request
+        pinned = set()
+        for page, layer in layers.items():
+            render_size = self.page_size_at_zoom(page, render_zoom)
+            page_rect = self.scroll_area.page_rect(page)
+            page_slot = self.scroll_area.slot(page)
+            distance = abs(page_rect.center().y() - viewport_center.y())
+            pinned.add((self.document_id, page, render_zoom, None))
+            pinned.add((self.document_id, page, PREVIEW_ZOOM, None))
+
+            if render_size.width() * render_size.height() > TILED_RENDER_THRESHOLD:
+                requests.extend(self.visible_tile_requests(page, layer, viewport_center, pinned))
+            else:
+                # Tiles left from a higher zoom would be painted, scaled down, over the page render
+                page_slot.clear_tiles()
+                if page_slot.page_zoom not in (render_zoom, exact_zoom):
+                    job = self.make_render_job(page)
+                    cached = self.pixmap_cache.get(job.key)
+                    if cached is not None:
+                        page_slot.set_page_pixmap(cached, render_zoom)
+                    else:
+                        # Until the right level arrives, downscale the nearest higher level we already have
+                        nearest_zoom = self.pixmap_cache.nearest_higher_zoom(self.document_id, page, render_zoom)
+                        if nearest_zoom is not None and nearest_zoom != page_slot.page_zoom:
+                            nearest = self.pixmap_cache.get((self.document_id, page, nearest_zoom, None))
+                            page_slot.set_page_pixmap(nearest, nearest_zoom)
+                        requests.append((job, layer, distance))
+
+                if background and layer == RENDER_LAYER_VISIBLE and page_slot.page_zoom == render_zoom != exact_zoom:
+                    # The view is still: replace the scaled pyramid level with a render at the exact zoom
+                    pinned.add((self.document_id, page, exact_zoom, None))
+                    job = self.make_render_job(page, exact=True)
+                    cached = self.pixmap_cache.get(job.key)
+                    if cached is not None:
+                        page_slot.set_page_pixmap(cached, exact_zoom)
+                    else:
+                        requests.append((job, RENDER_LAYER_REFINE, distance))
+
+            if layer == RENDER_LAYER_VISIBLE and page_slot.page_pixmap is None and render_zoom > PREVIEW_ZOOM:
+                preview_job = self.make_render_job(page, preview=True)
+                cached = self.pixmap_cache.get(preview_job.key)
+                if cached is not None:
+                    page_slot.set_preview(cached)
+                else:
+                    requests.append((preview_job, RENDER_LAYER_PREVIEW, distance))
+
+        for page in layers:
+            page_zoom = self.scroll_area.slot(page).page_zoom
+            if page_zoom is not None:
+                pinned.add((self.document_id, page, page_zoom, None))
+        self.pixmap_cache.set_pinned(pinned)
+
+        if background and prefetch and self.render_engine.backend == "process":
+            requests.extend(self.background_requests(prefetch[0], prefetch[-1], render_zoom))
+
+        queued = self.render_engine.schedule(requests)
+        self.render_engine.stats.record("schedule", time.perf_counter() - start)
+        scheduler_log.debug("Scheduled %d render jobs", queued)
+
+    def prefetch_range(self, first_page, last_page, render_zoom):
+        """Pages to prefetch around the visible [first_page, last_page].
+
+        At rest that is PREFETCH_PAGES either side. While scrolling, the side the
+        view moves towards covers the distance it travels during
+        PREFETCH_LOOKAHEAD_RENDERS page renders at the measured render cost, and
+        the side it leaves keeps one page. The range stops at PREFETCH_MAX_PAGES
+        ahead or once the pages in it would take PREFETCH_BUDGET_SHARE of the
+        pixmap cache, since they are pinned there.
+        """
+        total_pages = len(self.page_geometry)
+        before, after = PREFETCH_PAGES, PREFETCH_PAGES
+        velocity = self.scroll_motion.current()
+        if velocity and self.render_seconds_per_mpx is not None:
+            size = self.page_size_at_zoom(last_page if velocity > 0 else first_page, render_zoom)
+            page_seconds = self.render_seconds_per_mpx * size.width() * size.height() / 1e6
+            page_seconds /= self.render_engine.max_workers
+            lookahead = abs(velocity) * page_seconds * PREFETCH_LOOKAHEAD_RENDERS
+            ahead = self.pages_within(last_page if velocity > 0 else first_page, lookahead,
+                                      1 if velocity > 0 else -1, render_zoom)
+            if velocity > 0:
+                before, after = 1, max(PREFETCH_PAGES, ahead)
+            else:
+                before, after = max(PREFETCH_PAGES, ahead), 1
+        return range(max(0, first_page - before), min(total_pages, last_page + after + 1))
+
+    def pages_within(self, page, distance, direction, render_zoom):
+        """How many pages past `page` in `direction` (+1 down, -1 up) start within
+        `distance` pixels of its far edge, capped by count and prefetch budget."""
+        geometry = self.page_geometry
+        edge = geometry.page_top(page) + (self.page_size_at_zoom(page).height() if direction > 0 else 0)
+        budget = self.pixmap_cache.budget * PREFETCH_BUDGET_SHARE
+        count = 0
+        while count < PREFETCH_MAX_PAGES:
+            candidate = page + direction * (count + 1)
+            if not 0 <= candidate < len(geometry):
+                break
+            if direction > 0:
+                gap = geometry.page_top(candidate) - edge
+            else:
+                gap = edge - geometry.page_top(candidate) - self.page_size_at_zoom(candidate).height()
+            size = self.page_size_at_zoom(candidate, render_zoom)
+            budget -= size.width() * size.height() * 4
+            if gap > distance or budget < 0:
+                break
+            count += 1
+        return count
+
+    def background_requests(self, first_page, last_page, render_zoom):
+        """Idle-priority whole-page renders outside [first_page, last_page], nearest first.
+
+        Pages are taken alternately after and before the range (after first on a tie)
+        until BACKGROUND_RENDER_PAGES or the background share of the pixmap cache is used up.
+        Their results are only cached, not pinned, and are the first to be evicted.
+        """
+        budget = self.pixmap_cache.budget * BACKGROUND_RENDER_SHARE
+        total_pages = len(self.page_geometry)
+        viewport_top = self.scroll_area.verticalScrollBar().value()
+        after, before = last_page + 1, first_page - 1
+        requests = []
+        for _ in range(BACKGROUND_RENDER_PAGES):
+            if after < total_pages and (before < 0 or after - last_page <= first_page - before):
+                page, after = after, after + 1
+            elif before >= 0:
+                page, before = before, before - 1
+            else:
+                break
+
+            render_size = self.page_size_at_zoom(page, render_zoom)
+            pixels = render_size.width() * render_size.height()
+            budget -= pixels * 4
+            if budget < 0 or pixels > TILED_RENDER_THRESHOLD:
+                break
+            job = self.make_render_job(page)
+            if job.key not in self.pixmap_cache:
+                distance = abs(self.page_geometry.page_top(page) - viewport_top)
+                requests.append((job, RENDER_LAYER_BACKGROUND, distance))
+        return requests
+
+    def render_zoom(self):
+        """Pyramid level the current zoom is rendered at."""
+        return pyramid_zoom(self.zoom_factor)
 
-        self.process_next_render()
+    def make_render_job(self, page_number, tile=None, preview=False, exact=False):
+        """Describe a render of `page_number` at the current pyramid level (or the preview
+        zoom, or with `exact` the display zoom itself) and generation."""
+        if preview:
+            zoom_factor = PREVIEW_ZOOM
+        elif exact:
+            zoom_factor = round(self.zoom_factor, 6)
+        else:
+            zoom_factor = self.render_zoom()
+        return RenderJob(self.document_id, page_number, zoom_factor, tile, self.render_generation, preview)
+
+    def is_current_job(self, job):
+        """True if a finished job still belongs to the open document and the current zoom generation."""
+        return job.document_id == self.document_id and job.generation == self.render_generation
+
+    def page_size_at_zoom(self, page_number, zoom_factor=None):
+        """Size in pixels of a page at `zoom_factor` (the current display zoom by default)."""
+        return self.page_geometry.page_size(page_number, zoom_factor or self.zoom_factor)
+
+    def apply_page_geometry(self):
+        """Lay the pages out at the current zoom; only offsets and scroll ranges change."""
+        if self.page_geometry is None:
+            return
+        self.page_geometry.set_zoom(self.zoom_factor)
+        self.scroll_area.refresh()
+
+    def visible_tile_requests(self, page_number, layer, viewport_center, pinned):
+        """Render requests for the tiles of a page that intersect the viewport (plus a margin).
+
+        Tiles are addressed in pixels of the pyramid level; the page slot scales them to the page size.
+        The cache keys of all those tiles are added to `pinned`.
+        """
+        render_zoom = self.render_zoom()
+        scale = self.zoom_factor / render_zoom
+        page_slot = self.scroll_area.slot(page_number)
+        page_slot.set_tiled(render_zoom, scale)
+
+        page_rect = self.scroll_area.page_rect(page_number)
+        visible = QRectF(self.scroll_area.viewport().rect().translated(-page_rect.topLeft()))
+        visible = QRectF(visible.topLeft() / scale, visible.size() / scale).toAlignedRect()
+        visible = visible.adjusted(-TILE_MARGIN, -TILE_MARGIN, TILE_MARGIN, TILE_MARGIN)
+        visible = visible.intersected(QRect(QPoint(0, 0), self.page_size_at_zoom(page_number, render_zoom)))
+        # Tiles panned out of the margin are dropped so a tiled page holds about a screenful
+        page_slot.retain_tiles(visible)
+        if visible.isEmpty():
+            return []
+
+        center = (viewport_center - page_rect.topLeft()) / scale
+        requests = []
+        for row in range(visible.top() // TILE_SIZE, visible.bottom() // TILE_SIZE + 1):
+            for column in range(visible.left() // TILE_SIZE, visible.right() // TILE_SIZE + 1):
+                tile = (column, row)
+                pinned.add((self.document_id, page_number, render_zoom, tile))
+                if page_slot.has_tile(tile):
+                    continue
+                job = self.make_render_job(page_number, tile)
+                cached = self.pixmap_cache.get(job.key)
+                if cached is not None:
+                    page_slot.set_tile(tile, render_zoom, cached)
+                    continue
+                tile_center = QRect(column * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE).center()
+                distance = (tile_center - center).manhattanLength()
+                requests.append((job, layer, distance))
+        return requests
 
     def get_visible_pages(self):
         """Get the indices of currently visible pages."""
         scroll_bar = self.scroll_area.verticalScrollBar()
         scroll_top = scroll_bar.value()
-        scroll_bottom = scroll_top + self.scroll_area.height()
-
-        visible_pages = []
-        for i, widget in enumerate(self.page_widgets):
-            widget_top = widget.pos().y()
-            widget_bottom = widget_top + widget.height()
-            if widget_bottom >= scroll_top and widget_top <= scroll_bottom:
-                visible_pages.append(i)
-        
-        print(f"[DEBUG] Visible pages: {visible_pages}")
+        scroll_bottom = scroll_top + self.scroll_area.viewport().height()
+
+        # Binary search over the geometry table
+        visible_pages = self.page_geometry.pages_in_range(scroll_top, scroll_bottom)
+        layout_log.debug("Visible pages: %s", visible_pages)
         return visible_pages
 
-    def process_next_render(self):
-        """Process the next page in the render queue."""
-        with QMutexLocker(self.render_mutex):
-            if not self.rendering_queue or self.rendering_in_progress:
-                return
+    def handle_render_finished(self, job, image):
+        """Display a finished render; the engine workers pick up the next job on their own."""
+        stats = self.render_engine.stats
+        if not self.is_current_job(job):
+            image.release()
+            stats.increment("stale")
+            render_log.debug("Dropped stale render for page %d at zoom %.0f%%", job.page_number, job.zoom_factor * 100)
+            return
 
-            next_page = self.rendering_queue.pop(0)
-            self.rendering_in_progress.add(next_page)
+        if not job.preview and job.tile is None:
+            self.record_render_cost(job, image.seconds)
 
-        print(f"[DEBUG] Queued rendering for page {next_page}")
-        thread = RenderPageThread(self.current_document, next_page, self.zoom_factor)
-        thread.rendered.connect(self.handle_render_finished)
-        thread.start()
-        self.render_threads.append(thread)
+        start = time.perf_counter()
+        pixmap = image.to_pixmap()
+        stats.record("upload", time.perf_counter() - start)
 
-    def handle_render_finished(self, page_number, pixmap):
-        """Handle the completion of page rendering and trigger the next one."""
-        with QMutexLocker(self.render_mutex):
-            self.rendering_in_progress.remove(page_number)
+        self.pixmap_cache.put(job.key, pixmap)
 
-        if 0 <= page_number < len(self.page_widgets):
-            self.page_widgets[page_number].setPixmap(pixmap)
-        print(f"[DEBUG] Finished rendering for page {page_number}")
+        page_slot = self.scroll_area.existing_slot(job.page_number)
+        if page_slot is None:
+            # Background render of a page that is not on screen; it waits in the cache
+            render_log.debug("Cached background render for page %d", job.page_number)
+            return
+
+        start = time.perf_counter()
+        if job.preview:
+            page_slot.set_preview(pixmap)
+        elif job.tile is not None:
+            page_slot.set_tile(job.tile, job.zoom_factor, pixmap)
+        else:
+            page_slot.set_page_pixmap(pixmap, job.zoom_factor)
+        stats.record("display", time.perf_counter() - start)
+        render_log.debug("Displayed render for page %d tile %s", job.page_number, job.tile)
 
-        # Start the next render
-        self.process_next_render()
+    def record_render_cost(self, job, seconds):
+        """Fold a whole-page render time into the smoothed seconds-per-megapixel estimate."""
+        size = self.page_size_at_zoom(job.page_number, job.zoom_factor)
+        megapixels = size.width() * size.height() / 1e6
+        if seconds <= 0 or megapixels <= 0:
+            return
+        rate = seconds / megapixels
+        if self.render_seconds_per_mpx is None:
+            self.render_seconds_per_mpx = rate
+        else:
+            self.render_seconds_per_mpx = 0.8 * self.render_seconds_per_mpx + 0.2 * rate
+
+    def handle_pixmap_evicted(self, key, pixmap):
+        """Make the page slot let go of an evicted pixmap so its memory is actually freed."""
+        self.scroll_area.forget_pixmap(pixmap)
+        document_id, page_number, zoom_factor, tile = key
+        page_slot = self.scroll_area.existing_slot(page_number)
+        if document_id != self.document_id or page_slot is None:
+            return
+        if tile is None:
+            page_slot.release_pixmap(pixmap)
+        else:
+            page_slot.release_tile(tile, zoom_factor)
+        cache_log.debug("Evicted page %d tile %s at zoom %.0f%% from the pixmap cache", page_number, tile, zoom_factor * 100)
+
+    def frame_interval(self):
+        """Display frame interval in milliseconds, from the primary screen's refresh rate."""
+        screen = QApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen is not None else 0
+        if refresh_rate <= 0:
+            return SCROLL_FRAME_INTERVAL_MS
+        return max(1, int(1000 / refresh_rate))
 
     def handle_scroll(self):
-        """Handle scroll events to update the visible page and maintain scroll position during zoom."""
-        self.update_visible_page()
+        """Remember the scroll position and run the visible page pass at the next frame.
+
+        Wheel and trackpad scrolling change the value many times per frame; the
+        view itself repaints right away, everything else waits for the timer.
+        """
         self.last_scroll_value = self.scroll_area.verticalScrollBar().value()
+        if self.adjusting_scroll:
+            return  # layout correction from measure_pages, not the user
+        if not self.scroll_timer.isActive():
+            self.scroll_timer.start()
 
     def on_zoom_slider_changed(self):
         """Handle zoom slider changes."""
         self.zoom_factor = self.zoom_slider.value() / 100.0
         self.zoom_input.setText(str(self.zoom_slider.value()))
-        print(f"[DEBUG] Zoom changed via slider to {self.zoom_slider.value()}%")
-        self.reload_visible_pages_with_zoom()
+        layout_log.debug("Zoom changed via slider to %d%%", self.zoom_slider.value())
+        self.preview_zoom()
+
+    def on_zoom_slider_released(self):
+        """The drag is over: render at the final zoom without waiting for the settle delay."""
+        if self.zoom_settle_timer.isActive():
+            self.reload_visible_pages_with_zoom()
 
     def on_zoom_input_changed(self):
         """Handle zoom input changes."""
         value = int(self.zoom_input.text())
         self.zoom_slider.setValue(value)
         self.zoom_factor = value / 100.0
-        print(f"[DEBUG] Zoom changed via input to {value}%")
+        layout_log.debug("Zoom changed via input to %d%%", value)
         self.reload_visible_pages_with_zoom()
 
+    def preview_zoom(self):
+        """Lay the pages out at the current zoom and let the painter rescale what is
+        already rendered; renders follow once no change arrives for the settle delay."""
+        self.scroll_area.set_interactive(True)
+        # Tiles keep their level; only the scale they are drawn at follows the zoom
+        for page_slot in self.scroll_area.slots.values():
+            if page_slot.tile_zoom is not None:
+                page_slot.tile_scale = self.zoom_factor / page_slot.tile_zoom
+        self.apply_page_geometry()
+        self.scroll_area.verticalScrollBar().setValue(self.last_scroll_value)
+        self.scroll_timer.stop()
+        self.zoom_settle_timer.start(self.zoom_settle_delay())
+
+    def zoom_settle_delay(self):
+        """Milliseconds to wait for the next zoom change: the expected time to re-render the visible area."""
+        if self.render_seconds_per_mpx is None or not self.page_geometry:
+            return ZOOM_SETTLE_DEFAULT_MS
+        render_zoom = self.render_zoom()
+        pixels = 0
+        for page in self.get_visible_pages():
+            size = self.page_size_at_zoom(page, render_zoom)
+            pixels += size.width() * size.height()
+        # Tiled pages only render what is on screen
+        viewport = self.scroll_area.viewport().size() * (render_zoom / self.zoom_factor)
+        pixels = min(pixels, viewport.width() * viewport.height())
+        seconds = self.render_seconds_per_mpx * pixels / 1e6 / self.render_engine.max_workers
+        return int(min(ZOOM_SETTLE_MAX_MS, max(ZOOM_SETTLE_MIN_MS, seconds * 1000)))
+
     def reload_visible_pages_with_zoom(self):
         """Reload only the visible pages at the current zoom level."""
-        print(f"[DEBUG] Reloading visible pages with zoom {self.zoom_factor * 100:.0f}%")
-        self.queue_render_visible_pages()
+        self.zoom_settle_timer.stop()
+        self.scroll_area.set_interactive(False)
+        self.render_generation += 1
+        layout_log.debug("Reloading visible pages with zoom %.0f%%", self.zoom_factor * 100)
+        self.scroll_motion.reset()
+        self.apply_page_geometry()
         self.scroll_area.verticalScrollBar().setValue(self.last_scroll_value)
+        self.update_visible_page()
+
+    def collect_stats(self):
+        """Render engine statistics plus the pixmap cache and the open document."""
+        snapshot = self.render_engine.stats_snapshot()
+        snapshot["pixmap_cache"] = self.pixmap_cache.stats()
+        snapshot["compositor"] = self.scroll_area.compositor_stats()
+        snapshot["memory"] = dict(memory_usage(self.document_mapping.path if self.document_mapping else None),
+                                  open_mode=OPEN_MODE)
+        snapshot["document"] = {
+            "path": self.render_engine.document_source,
+            "pages": len(self.page_geometry) if self.page_geometry else 0,
+            "zoom": self.zoom_factor,
+        }
+        return snapshot
+
+    def write_stats(self, path):
+        try:
+            with open(path, "w") as f:
+                json.dump(self.collect_stats(), f, indent=2)
+        except OSError as e:
+            log.error("Could not write render stats to %s: %s", path, e)
+            return
+        log.info("Render stats written to %s", path)
+
+    def export_stats(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, "Export Render Stats", "render-stats.json", "JSON Files (*.json)")
+        if file_name:
+            self.write_stats(file_name)
+
+    def closeEvent(self, event):
+        """Stop the render workers (and a pending open) before the window goes away."""
+        if self.stats_file:
+            self.write_stats(self.stats_file)
+        self.cancel_open()
+        for loader in self.findChildren(DocumentLoader):
+            loader.cancel()
+            loader.wait()
+        self.render_engine.shutdown()
+        self.discard_repaired_document()
+        super().closeEvent(event)
+
+
+# Batch rendering (`acrobatprokiller.py render ...`)
+
+def parse_page_ranges(spec, page_count):
+    """0-based page indices for a 1-based spec like "1-5,8,10-" (every page when empty).
+
+    Raises ValueError for a malformed range, one that starts past the last page,
+    or a spec that selects no pages at all.
+    """
+    if not spec:
+        pages = list(range(page_count))
+    else:
+        pages = []
+        for part in spec.split(","):
+            first, dash, last = part.strip().partition("-")
+            start = int(first) if first else 1
+            end = (int(last) if last else page_count) if dash else start
+            if start < 1 or end < start:
+                raise ValueError(f"invalid page range: {part}")
+            if start > page_count:
+                raise ValueError(f"page range {part} starts past the last page ({page_count})")
+            pages.extend(range(start - 1, min(end, page_count)))
+    if not pages:
+        raise ValueError("no pages to render")
+    return list(dict.fromkeys(pages))
+
+
+def batch_render(source, pages, dpi, out_dir, image_format="png", max_workers=None, backend="process"):
+    """Render `pages` of `source` at `dpi` into `out_dir`, one image file per page.
+
+    Uses the viewer's RenderEngine and worker pool without a display. Pages are
+    written from the worker threads as they finish, so encoding runs in
+    parallel and no finished page is held in memory. Returns (written, failed, seconds).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    zoom_factor = dpi / 72
+    stem = os.path.splitext(os.path.basename(source))[0]
+    digits = len(str(max(pages, default=0) + 1))
+    mutex = QMutex()
+    page_done = QWaitCondition()
+    counts = {"written": 0, "failed": 0}
+
+    def finish(outcome):
+        with QMutexLocker(mutex):
+            counts[outcome] += 1
+            page_done.wakeAll()
+
+    def on_rendered(job, image):
+        path = os.path.join(out_dir, f"{stem}-{job.page_number + 1:0{digits}d}.{image_format}")
+        saved = image.image.save(path, image_format.upper())
+        image.release()
+        if not saved:
+            render_log.error("Could not write %s", path)
+        finish("written" if saved else "failed")
+
+    def on_failed(job, error):
+        finish("failed")
+
+    engine = RenderEngine(max_workers, backend)
+    engine.disk_cache = None  # the output directory is the cache here
+    engine.rendered.connect(on_rendered, Qt.DirectConnection)
+    engine.failed.connect(on_failed, Qt.DirectConnection)
+
+    start = time.perf_counter()
+    engine.set_document(source)
+    for order, page_number in enumerate(pages):
+        engine.submit(RenderJob(1, page_number, zoom_factor, None, 0), RENDER_LAYER_VISIBLE, order)
+
+    last_report = start
+    with QMutexLocker(mutex):
+        while counts["written"] + counts["failed"] < len(pages):
+            page_done.wait(mutex, 1000)
+            now = time.perf_counter()
+            if now - last_report >= 1:
+                last_report = now
+                done = counts["written"] + counts["failed"]
+                render_log.info("%d/%d pages, %.1f pages/s", done, len(pages), done / (now - start))
+    seconds = time.perf_counter() - start
+    engine.shutdown()
+    return counts["written"], counts["failed"], seconds
+
+
+def add_logging_arguments(parser):
+    parser.add_argument("--log-level", default=LOG_LEVEL,
+                        help="log level for every subsystem (default: APK_LOG_LEVEL or WARNING)")
+    parser.add_argument("--log", default=LOG_SUBSYSTEMS, metavar="SUBSYSTEM=LEVEL,...",
+                        help="per-subsystem levels, e.g. render=debug,cache=info (default: APK_LOG)")
+    parser.add_argument("--debug", action="store_true", help="shorthand for --log-level debug")
+
+
+def render_main(argv):
+    """Command line entry point of `acrobatprokiller.py render`."""
+    parser = argparse.ArgumentParser(prog="acrobatprokiller.py render",
+                                     description="Rasterize PDF pages to image files without a display")
+    parser.add_argument("pdf", help="PDF to render")
+    parser.add_argument("--dpi", type=float, default=150, help="output resolution (default: 150)")
+    parser.add_argument("--pages", default="", help="1-based pages, e.g. 1-500,510,600- (default: all)")
+    parser.add_argument("--out", default=".", help="output directory (default: current directory)")
+    parser.add_argument("--format", default="png", choices=("png", "jpg", "ppm"), help="image format")
+    parser.add_argument("--workers", type=int, help="render workers (default: one per core)")
+    parser.add_argument("--backend", default="process", choices=("process", "thread"),
+                        help="render processes use every core (default: process)")
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        configure_logging("DEBUG" if args.debug else args.log_level, args.log)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.dpi <= 0:
+        parser.error(f"--dpi must be positive, not {args.dpi:g}")
+    if args.workers is not None and args.workers < 1:
+        parser.error(f"--workers must be at least 1, not {args.workers}")
+
+    app = QCoreApplication(sys.argv[:1])
+    try:
+        with fitz.open(args.pdf) as document:
+            pages = parse_page_ranges(args.pages, len(document))
+    except (RuntimeError, ValueError) as e:
+        parser.error(str(e))
+
+    written, failed, seconds = batch_render(args.pdf, pages, args.dpi, args.out, args.format,
+                                            args.workers, args.backend)
+    print(f"Rendered {written} pages in {seconds:.2f}s ({written / seconds if seconds else 0:.1f} pages/s)"
+          + (f", {failed} failed" if failed else ""))
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    viewer = PDFViewer()
+    if sys.argv[1:2] == ["render"]:
+        sys.exit(render_main(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description="Fast PDF viewer")
+    add_logging_arguments(parser)
+    parser.add_argument("--stats-json", default=STATS_FILE, metavar="PATH",
+                        help="write render statistics to PATH on exit (default: APK_STATS_FILE)")
+    parser.add_argument("--compositor", choices=("raster", "opengl"), default=COMPOSITOR,
+                        help="how pages are drawn on screen (default: APK_COMPOSITOR or raster)")
+    args, qt_args = parser.parse_known_args()
+    try:
+        configure_logging("DEBUG" if args.debug else args.log_level, args.log)
+    except ValueError as e:
+        parser.error(str(e))
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    viewer = PDFViewer(args.compositor)
+    viewer.stats_file = args.stats_json
     viewer.show()
     sys.exit(app.exec_())
@@ -0,0 +1,9 @@
+"""Headless benchmarks for the viewers in this repo.
+
+Generates a reproducible PDF corpus with PyMuPDF and drives a viewer's
+PDFViewer under QT_QPA_PLATFORM=offscreen to measure open time,
+time-to-first-page, scroll throughput, zoom latency and peak RSS.
+
+    python -m benchmarks run --viewer acrobatprokiller.py --viewer pdf31.py --out results.json
+    python -m benchmarks compare old.json new.json
+"""
@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import fitz  # PyMuPDF
+from PyQt5.QtCore import QT_VERSION_STR
+
+from benchmarks.corpus import GENERATORS, ensure_corpus
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS = os.path.join(REPO_ROOT, "benchmarks", "corpus")
+MEASURE_TIMEOUT = 300
+
+# Metrics compared between two result files; True where higher is better
+COMPARED_METRICS = {
+    "open_s": False,
+    "first_page_s": False,
+    "scroll_steps_per_s": True,
+    "scroll_settle_s": False,
+    "zoom_settle_s": False,
+    "peak_rss_mb": False,
+}
+
+
+def git_revision():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ("-dirty" if dirty else "")
+
+
+def run_measurement(viewer, document_path, env, timeout=MEASURE_TIMEOUT):
+    """Measure one viewer/document pair in a fresh process."""
+    command = [sys.executable, "-m", "benchmarks.measure", viewer, document_path]
+    try:
+        completed = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+                                   timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {"error": f"exit code {completed.returncode}: {completed.stderr.strip()[-500:]}"}
+    return json.loads(lines[-1])
+
+
+def run(args):
+    documents = ensure_corpus(args.corpus, args.document)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    if not args.disk_cache:
+        # A warm on-disk render cache would turn every render into a file read
+        env["APK_DISK_CACHE_MB"] = "0"
+
+    results = []
+    for viewer in args.viewer:
+        for name, path in documents.items():
+            for repeat in range(args.repeat):
+                print(f"{viewer} {name} #{repeat + 1}...", file=sys.stderr, flush=True)
+                result = {"viewer": viewer, "document": name, "repeat": repeat}
+                result.update(run_measurement(viewer, path, env, args.timeout))
+                results.append(result)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pymupdf": fitz.VersionBind,
+            "qt": QT_VERSION_STR,
+            "disk_cache": args.disk_cache,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def flatten(result):
+    """Pick the compared metrics out of one measurement."""
+    scroll = result.get("scroll") or {}
+    zooms = [zoom["settle_s"] for zoom in result.get("zoom") or () if zoom["settle_s"] is not None]
+    return {
+        "open_s": result.get("open_s"),
+        "first_page_s": result.get("first_page_s"),
+        "scroll_steps_per_s": scroll.get("steps_per_s"),
+        "scroll_settle_s": scroll.get("settle_s"),
+        "zoom_settle_s": sum(zooms) / len(zooms) if zooms else None,
+        "peak_rss_mb": result.get("peak_rss_mb"),
+    }
+
+
+def median_metrics(path):
+    """{(viewer, document): {metric: median over repeats}} of a result file."""
+    with open(path) as f:
+        results = json.load(f)["results"]
+    samples = {}
+    for result in results:
+        if "error" in result:
+            continue
+        metrics = samples.setdefault((result["viewer"], result["document"]), {})
+        for metric, value in flatten(result).items():
+            if value is not None:
+                metrics.setdefault(metric, []).append(value)
+    return {
+        key: {metric: sorted(values)[len(values) // 2] for metric, values in metrics.items()}
+        for key, metrics in samples.items()
+    }
+
+
+def compare(args):
+    before = median_metrics(args.before)
+    after = median_metrics(args.after)
+    print(f"{'viewer':<24}{'document':<12}{'metric':<20}{'before':>12}{'after':>12}{'change':>10}")
+    for key in sorted(before.keys() & after.keys()):
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before[key].get(metric), after[key].get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            better = change > 0 if higher_is_better else change < 0
+            marker = "+" if better and abs(change) >= args.threshold else "-" if abs(change) >= args.threshold else ""
+            print(f"{key[0]:<24}{key[1]:<12}{metric:<20}{old:>12.4g}{new:>12.4g}{change:>+9.1%}{marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Headless viewer benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="measure viewers on the synthetic corpus")
+    run_parser.add_argument("--viewer", action="append",
+                            help="viewer script relative to the repo root (repeatable, default: acrobatprokiller.py)")
+    run_parser.add_argument("--document", action="append", choices=sorted(GENERATORS),
+                            help="corpus document to use (repeatable, default: all)")
+    run_parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="directory of generated PDFs")
+    run_parser.add_argument("--repeat", type=int, default=1, help="measurements per viewer and document")
+    run_parser.add_argument("--timeout", type=int, default=MEASURE_TIMEOUT,
+                            help="seconds before a measurement is recorded as an error")
+    run_parser.add_argument("--disk-cache", action="store_true", help="leave the on-disk render cache enabled")
+    run_parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    run_parser.set_defaults(handler=run)
+
+    corpus_parser = commands.add_parser("corpus", help="only generate the corpus")
+    corpus_parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="directory of generated PDFs")
+    corpus_parser.add_argument("--document", action="append", choices=sorted(GENERATORS))
+    corpus_parser.set_defaults(handler=lambda args: print("\n".join(ensure_corpus(args.corpus, args.document).values())))
+
+    compare_parser = commands.add_parser("compare", help="compare two result files (medians over repeats)")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument("--threshold", type=float, default=0.05,
+                                help="relative change marked as better (+) or worse (-)")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    if getattr(args, "viewer", False) is None:
+        args.viewer = ["acrobatprokiller.py"]
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
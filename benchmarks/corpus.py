@@ -0,0 +1,120 @@
+import os
+import random
+
+import fitz  # PyMuPDF
+
+
+# Bump when a generator changes so stale corpus files are rebuilt
+CORPUS_VERSION = 1
+
+# Fixed dates and no random file ID, so the same generator writes the same bytes
+METADATA = {
+    "producer": "acrobatprokiller benchmarks",
+    "creationDate": "D:20250101000000Z",
+    "modDate": "D:20250101000000Z",
+}
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat"
+).split()
+
+
+def text_document(document, rng):
+    """200 letter pages of dense body text."""
+    for _ in range(200):
+        page = document.new_page()
+        words = [rng.choice(WORDS) for _ in range(900)]
+        page.insert_textbox(page.rect + (36, 36, -36, -36), " ".join(words), fontsize=9)
+
+
+def vector_document(document, rng):
+    """40 pages of a few thousand strokes and curves each, like a CAD export."""
+    for _ in range(40):
+        page = document.new_page()
+        width, height = page.rect.width, page.rect.height
+        shape = page.new_shape()
+        for _ in range(3000):
+            start = fitz.Point(rng.uniform(0, width), rng.uniform(0, height))
+            end = fitz.Point(rng.uniform(0, width), rng.uniform(0, height))
+            if rng.random() < 0.5:
+                shape.draw_line(start, end)
+            else:
+                control = fitz.Point(rng.uniform(0, width), rng.uniform(0, height))
+                shape.draw_bezier(start, control, control, end)
+            shape.finish(color=(rng.random(), rng.random(), rng.random()), width=0.3)
+        shape.commit()
+
+
+def image_document(document, rng):
+    """20 pages, each covered by its own 1024x1024 photo-sized image."""
+    block = 8
+    size = 1024
+    for _ in range(20):
+        rows = []
+        for _ in range(size // block):
+            row = b"".join(bytes((rng.randrange(256), rng.randrange(256), rng.randrange(256))) * block
+                           for _ in range(size // block))
+            rows.extend([row] * block)
+        pixmap = fitz.Pixmap(fitz.csRGB, size, size, b"".join(rows), False)
+        page = document.new_page()
+        page.insert_image(page.rect + (36, 36, -36, -36), pixmap=pixmap)
+
+
+def many_pages_document(document, rng):
+    """10,000 short pages: open and layout cost, not rasterization."""
+    for i in range(10000):
+        page = document.new_page(width=rng.choice((595, 612)), height=rng.choice((792, 842)))
+        page.insert_text((72, 72), f"Page {i + 1}", fontsize=24)
+
+
+def huge_page_document(document, rng):
+    """3 pages of 200x200 inches (the PDF maximum) with a fine grid, for tiled rendering."""
+    for _ in range(3):
+        page = document.new_page(width=14400, height=14400)
+        shape = page.new_shape()
+        for offset in range(0, 14400, 72):
+            shape.draw_line((offset, 0), (offset, 14400))
+            shape.draw_line((0, offset), (14400, offset))
+        shape.finish(color=(0.6, 0.6, 0.8), width=1)
+        for _ in range(500):
+            center = fitz.Point(rng.uniform(0, 14400), rng.uniform(0, 14400))
+            shape.draw_circle(center, rng.uniform(20, 400))
+            shape.finish(color=(0, 0, 0), fill=(rng.random(), rng.random(), rng.random()), width=4)
+        shape.commit()
+
+
+GENERATORS = {
+    "text": text_document,
+    "vector": vector_document,
+    "image": image_document,
+    "10k-pages": many_pages_document,
+    "huge-page": huge_page_document,
+}
+
+
+def corpus_path(directory, name):
+    return os.path.join(directory, f"{name}-v{CORPUS_VERSION}.pdf")
+
+
+def ensure_document(directory, name):
+    """Path of a corpus document, generating it first if it is missing."""
+    path = corpus_path(directory, name)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(directory, exist_ok=True)
+    document = fitz.open()
+    GENERATORS[name](document, random.Random(f"{name}-{CORPUS_VERSION}"))
+    document.set_metadata(METADATA)
+    temp_path = path + ".tmp"
+    document.save(temp_path, garbage=3, deflate=True, no_new_id=True)
+    document.close()
+    os.replace(temp_path, path)
+    return path
+
+
+def ensure_corpus(directory, names=None):
+    """Generate whatever is missing of the corpus; returns {name: path}."""
+    return {name: ensure_document(directory, name) for name in (names or GENERATORS)}
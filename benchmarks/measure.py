@@ -0,0 +1,160 @@
+"""Measure one viewer on one document; run as a subprocess by `python -m benchmarks run`.
+
+    python -m benchmarks.measure VIEWER.py DOCUMENT.pdf
+
+Prints a single JSON object on stdout. Each measurement gets a fresh process
+so peak RSS and leftover render threads never leak into the next one.
+"""
+import argparse
+import importlib
+import json
+import os
+import resource
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QFileDialog
+
+
+SCROLL_STEPS = 200
+ZOOM_LEVELS = (150, 300, 75, 100)
+SETTLE_TIMEOUT = 60.0
+
+
+def load_viewer_module(path):
+    """Import a viewer script by file name, with its directory on sys.path so
+    render processes spawned by it can import it again."""
+    directory, file_name = os.path.split(os.path.abspath(path))
+    sys.path.insert(0, directory)
+    return importlib.import_module(os.path.splitext(file_name)[0])
+
+
+def first_page_ready(viewer):
+    """True once the first page shows a real render (not a blank or preview)."""
+    view = viewer.scroll_area
+    if hasattr(view, "existing_slot"):
+        page_slot = view.existing_slot(0)
+        return page_slot is not None and (page_slot.page_zoom is not None or bool(page_slot.tiles))
+    page_widgets = getattr(viewer, "page_widgets", None)
+    if page_widgets:
+        pixmap = page_widgets[0].pixmap()
+        return pixmap is not None and not pixmap.isNull()
+    return False
+
+
+def document_open(viewer):
+    """True once the viewer has the document (viewers that open in the background install it later)."""
+    return getattr(viewer, "document_loader", None) is None
+
+
+def render_idle(viewer):
+    """True when the viewer has no queued or running renders and no pending timer."""
+    for timer_name in ("scroll_timer", "zoom_settle_timer", "debounce_timer"):
+        timer = getattr(viewer, timer_name, None)
+        if timer is not None and timer.isActive():
+            return False
+    engine = getattr(viewer, "render_engine", None)
+    if engine is not None:
+        if hasattr(engine, "stats_snapshot"):
+            queue = engine.stats_snapshot()["queue"]
+            return queue["queued"] == 0 and queue["in_flight"] == 0
+        return not engine.queued and not any(job is not None for job in engine.in_flight.values())
+    if hasattr(viewer, "rendering_in_progress"):
+        return not viewer.rendering_queue and not viewer.rendering_in_progress
+    return True
+
+
+def wait_until(app, predicate, timeout=SETTLE_TIMEOUT):
+    """Pump events until `predicate()` holds; returns the seconds waited, or None on timeout."""
+    start = time.perf_counter()
+    while True:
+        app.processEvents()
+        if predicate():
+            return time.perf_counter() - start
+        if time.perf_counter() - start > timeout:
+            return None
+        time.sleep(0.001)
+
+
+def peak_rss_mb(who):
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(who).ru_maxrss / 1024, 1)
+
+
+def measure(app, viewer, document_path):
+    result = {}
+    QFileDialog.getOpenFileName = staticmethod(lambda *args, **kwargs: (document_path, ""))
+
+    start = time.perf_counter()
+    viewer.open_pdf()
+    wait_until(app, lambda: document_open(viewer))
+    result["open_s"] = round(time.perf_counter() - start, 4)
+    first_page = wait_until(app, lambda: first_page_ready(viewer))
+    result["first_page_s"] = None if first_page is None else round(result["open_s"] + first_page, 4)
+    wait_until(app, lambda: render_idle(viewer))
+
+    # Scroll throughput: quarter-viewport steps, one event pass per step, like a fast wheel
+    scroll_bar = viewer.scroll_area.verticalScrollBar()
+    step = max(1, viewer.scroll_area.viewport().height() // 4)
+    steps = min(SCROLL_STEPS, scroll_bar.maximum() // step)
+    start = time.perf_counter()
+    for _ in range(steps):
+        scroll_bar.setValue(scroll_bar.value() + step)
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+    settle = wait_until(app, lambda: render_idle(viewer))
+    result["scroll"] = {
+        "steps": steps,
+        "seconds": round(elapsed, 4),
+        "steps_per_s": round(steps / elapsed, 1) if steps and elapsed else None,
+        "settle_s": None if settle is None else round(settle, 4),
+    }
+
+    # Zoom latency: from the slider change until every requested render has landed
+    zooms = []
+    for zoom in ZOOM_LEVELS:
+        zoom = min(zoom, viewer.zoom_slider.maximum())
+        start = time.perf_counter()
+        viewer.zoom_slider.setValue(zoom)
+        app.processEvents()
+        settle = wait_until(app, lambda: render_idle(viewer))
+        zooms.append({"zoom": zoom, "settle_s": None if settle is None else round(time.perf_counter() - start, 4)})
+    result["zoom"] = zooms
+
+    if hasattr(viewer, "collect_stats"):
+        result["render_stats"] = viewer.collect_stats()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("viewer", help="viewer script, e.g. acrobatprokiller.py")
+    parser.add_argument("document", help="PDF to open")
+    args = parser.parse_args()
+
+    # Viewers print debug output; keep stdout for the result line
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+
+    app = QApplication(sys.argv[:1])
+    module = load_viewer_module(args.viewer)
+    viewer = module.PDFViewer()
+    viewer.show()
+    try:
+        result = measure(app, viewer, os.path.abspath(args.document))
+    finally:
+        viewer.close()
+        app.processEvents()
+    result["peak_rss_mb"] = peak_rss_mb(resource.RUSAGE_SELF)
+    result["children_peak_rss_mb"] = peak_rss_mb(resource.RUSAGE_CHILDREN)
+
+    stdout.write(json.dumps(result) + "\n")
+    stdout.flush()
+    # Older viewers leave render threads running; do not wait for them
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()